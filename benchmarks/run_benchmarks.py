@@ -0,0 +1,126 @@
+"""Time the dashboard pipeline on synthetic issues, without any GitHub call.
+
+    python benchmarks/run_benchmarks.py --rows 10000 100000 1000000 --output bench_results.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from synthetic import make_issues
+from dashboard.charts import render_charts
+from dashboard.dashboard_organization import OrganizationalDashboard
+from dashboard.sync_store import SyncStore
+
+
+def measure(results: dict, name: str, func, *args, trace_memory: bool = False, **kwargs):
+    """Run one stage, recording wall time and memory.
+
+    ``max_rss_mb`` is the process high-water mark after the stage; with
+    ``trace_memory`` the stage's own peak Python/NumPy allocations are
+    traced too, which slows the stage down.
+    """
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    value = func(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    results[name] = {
+        "seconds": round(seconds, 4),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+    if trace_memory:
+        results[name]["peak_traced_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        tracemalloc.stop()
+    print(f"  {name:<32} {seconds:9.3f}s {results[name]['max_rss_mb']:10.1f} MB")
+    return value
+
+
+def run_case(n_rows: int, args, workdir: str) -> dict:
+    print(f"▶ {n_rows} issues")
+    stages = {}
+
+    def stage(name, func, *stage_args, **stage_kwargs):
+        return measure(stages, name, func, *stage_args, trace_memory=args.trace_memory, **stage_kwargs)
+
+    issues = stage(
+        "generate", make_issues, n_rows,
+        closed_ratio=args.closed_ratio, spread_days=args.spread_days,
+        n_repositories=args.repositories, seed=args.seed,
+    )
+    store = SyncStore(path=os.path.join(workdir, f"bench_{n_rows}.duckdb"))
+    stage("store_upsert", store.upsert, "issues", issues)
+    repositories = sorted(issues["repository"].unique())
+    del issues
+
+    dashboard = OrganizationalDashboard(
+        cache=store, repositories=repositories,
+        monte_carlo_simulations=args.simulations, monte_carlo_seed=args.seed,
+        output_dir=os.path.join(workdir, f"charts_{n_rows}"), chart_cache=False,
+    )
+    stage("load", dashboard.load_issues)
+    stage("partials", dashboard.issue_partials)
+    stage("compute_stats", dashboard.compute_stats)
+    stage("compute_repository_stats", dashboard.compute_repository_stats)
+
+    def weekly_stats_python():
+        # Rebuild the partials so pandas is timed from the issues, like SQL from the store
+        dashboard.partials = None
+        return dashboard.compute_weekly_delivery_stats()
+
+    dashboard.aggregation_backend = "python"
+    stage("weekly_stats_python", weekly_stats_python)
+    dashboard.aggregation_backend = "sql"
+    weekly_data = stage("weekly_stats_sql", dashboard.compute_weekly_delivery_stats)
+    flow = stage("flow_metrics", dashboard.compute_flow_metrics)
+    breakdowns = stage("breakdowns", dashboard.compute_breakdowns)
+    mc_results = stage("monte_carlo", dashboard.run_monte_carlo_simulation, weekly_data)
+
+    jobs = [dashboard.weekly_delivery_job(weekly_data), dashboard.burnup_chart_job(weekly_data)[0]]
+    jobs.append(dashboard.flow_metrics_job(flow))
+    jobs += dashboard.breakdown_jobs(breakdowns, dashboard.top_slices(breakdowns))
+    jobs += dashboard.monte_carlo_jobs(mc_results)
+    stage("render_charts", render_charts, jobs, args.render_workers, False)
+
+    return {"rows": n_rows, "stages": stages}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--closed-ratio", type=float, default=0.7)
+    parser.add_argument("--spread-days", type=int, default=730)
+    parser.add_argument("--repositories", type=int, default=10)
+    parser.add_argument("--simulations", type=int, default=100_000)
+    parser.add_argument("--render-workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-memory", action="store_true", help="trace peak allocations per stage (slower)")
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        cases = [run_case(n_rows, args, workdir) for n_rows in args.rows]
+
+    results = {
+        "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {k: v for k, v in vars(args).items() if k not in ("rows", "output")},
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "cases": cases,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Resultados salvos em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
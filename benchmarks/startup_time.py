@@ -0,0 +1,81 @@
+"""Measure CLI startup time per command and check it against a budget.
+
+    python benchmarks/startup_time.py --runs 5
+
+Each command is timed as a fresh interpreter importing that command's
+modules (report.COMMAND_MODULES); ``help`` times ``report.py --help``.
+Exits with status 1 when a median exceeds its budget.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# Median wall time budget per command, in seconds
+BUDGETS = {
+    "help": 0.3,
+    "analyze": 2.0,
+    "render": 3.0,
+    "collaboration": 2.5,
+    "fetch": 5.0,
+    "serve": 3.0,
+    "backtest": 2.0,
+}
+
+IMPORT_SNIPPET = "import sys; sys.path.insert(0, {src!r}); import report; report.import_command_modules({command!r})"
+
+
+def command_argv(command: str) -> list:
+    if command == "help":
+        return [sys.executable, os.path.join(SRC, "report.py"), "--help"]
+    return [sys.executable, "-c", IMPORT_SNIPPET.format(src=SRC, command=command)]
+
+
+def time_command(command: str, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command_argv(command), check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def slowest_imports(command: str, top: int) -> list:
+    """Return the ``top`` imports with the highest cumulative time from ``-X importtime``."""
+    argv = command_argv(command)
+    result = subprocess.run([argv[0], "-X", "importtime"] + argv[1:], capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("commands", nargs="*", default=list(BUDGETS))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="show the slowest imports of each command")
+    args = parser.parse_args()
+
+    over_budget = []
+    for command in args.commands:
+        median = time_command(command, args.runs)
+        budget = BUDGETS[command]
+        status = "✅" if median <= budget else "❌"
+        print(f"{status} {command:<8} {median:7.3f}s (orçamento {budget:.1f}s)")
+        for micros, module in slowest_imports(command, args.top):
+            print(f"      {micros / 1e6:7.3f}s  {module}")
+        if median > budget:
+            over_budget.append(command)
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
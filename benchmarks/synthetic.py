@@ -0,0 +1,45 @@
+import json
+import numpy as np
+import pandas as pd
+
+START_DATE = np.datetime64("2020-01-01T00:00:00", "s")
+
+
+def _iso(timestamps: np.ndarray) -> np.ndarray:
+    return np.char.add(np.datetime_as_string(timestamps, unit="s"), "Z").astype(object)
+
+
+def make_issues(n_rows: int, closed_ratio: float = 0.7, spread_days: int = 730,
+                n_repositories: int = 10, n_developers: int = 50, seed: int = 0) -> pd.DataFrame:
+    """Build an issues frame shaped like the records kept in the sync store.
+
+    Issues are created uniformly over ``spread_days`` and ``closed_ratio`` of
+    them are closed after an exponential lead time.
+    """
+    rng = np.random.default_rng(seed)
+    created = START_DATE + rng.integers(0, spread_days * 86400, n_rows).astype("timedelta64[s]")
+    closed = rng.random(n_rows) < closed_ratio
+    lead_time = rng.exponential(14 * 86400, n_rows).astype(np.int64).astype("timedelta64[s]")
+    closed_at = np.where(closed, _iso(created + lead_time), None)
+    updated_at = np.where(closed, closed_at, _iso(created))
+
+    repositories = np.array([f"synthetic/repo-{i}" for i in range(n_repositories)], dtype=object)
+    assignees = np.array(
+        [json.dumps([{"login": f"dev-{i}"}]) for i in range(n_developers)] + ["[]"], dtype=object
+    )
+    labels = np.array(
+        [json.dumps([{"name": name}]) for name in ("bug", "enhancement", "documentation")] + ["[]"], dtype=object
+    )
+    milestones = np.array([json.dumps({"title": f"v{i}.0"}) for i in range(5)] + [None], dtype=object)
+
+    return pd.DataFrame({
+        "id": np.arange(n_rows).astype(str).astype(object),
+        "repository": repositories[rng.integers(0, n_repositories, n_rows)],
+        "state": np.where(closed, "closed", "open").astype(object),
+        "created_at": _iso(created),
+        "closed_at": closed_at,
+        "updated_at": updated_at,
+        "assignees": assignees[rng.integers(0, len(assignees), n_rows)],
+        "labels": labels[rng.integers(0, len(labels), n_rows)],
+        "milestone": milestones[rng.integers(0, len(milestones), n_rows)],
+    })
@@ -0,0 +1,65 @@
+from typing import List, Optional
+import json
+import re
+import numpy as np
+import pandas as pd
+
+# Slice dimensions: the issue column holding them and the key naming each item
+DIMENSIONS = {
+    "assignee": ("assignees", "login"),
+    "label": ("labels", "name"),
+    "milestone": ("milestone", "title"),
+}
+
+
+def item_names(value: Optional[str], key: str) -> List[str]:
+    """Names of the items of a stored JSON list, or of a single JSON object."""
+    if not isinstance(value, str):
+        return []
+    items = json.loads(value)
+    if isinstance(items, dict):
+        items = [items]
+    if not isinstance(items, list):
+        return []
+    return [item[key] for item in items if isinstance(item, dict) and item.get(key) is not None]
+
+
+def explode_dimension(column: pd.Series, key: str) -> pd.DataFrame:
+    """``(row, value)`` pairs of a JSON column, one per item of each row.
+
+    Many issues share the same assignee or label list, so each distinct
+    text is parsed once and rows are matched to their items with a join.
+    Categorical columns reuse their codes instead of hashing every row.
+    """
+    codes, uniques = pd.factorize(column)
+    names = [item_names(unique, key) for unique in uniques]
+    pairs = pd.DataFrame({
+        "code": np.repeat(np.arange(len(names)), [len(n) for n in names]),
+        "value": [name for n in names for name in n],
+    })
+    rows = pd.DataFrame({"row": np.arange(len(codes)), "code": codes})
+    return rows.merge(pairs, on="code")[["row", "value"]]
+
+
+def count_by_slice(batch: pd.DataFrame, period: pd.Series, dimensions: List[str]) -> pd.Series:
+    """Issues of one batch per ``(dimension, value, period, state)`` in a single groupby."""
+    parts = []
+    for dimension in dimensions:
+        column, key = DIMENSIONS[dimension]
+        if column not in batch.columns:
+            continue
+        pairs = explode_dimension(batch[column], key)
+        pairs["dimension"] = dimension
+        parts.append(pairs)
+    if not parts:
+        return pd.Series(dtype=np.int64)
+    slices = pd.concat(parts, ignore_index=True)
+    rows = slices["row"].to_numpy()
+    slices["period"] = period.to_numpy()[rows]
+    slices["state"] = batch["state"].to_numpy()[rows]
+    return slices.groupby(["dimension", "value", "period", "state"]).size()
+
+
+def slug(value: str) -> str:
+    """File name friendly form of a slice value."""
+    return re.sub(r"[^\w.-]+", "_", value).strip("_") or "_"
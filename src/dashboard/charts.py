@@ -0,0 +1,251 @@
+from typing import Callable, List, NamedTuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import io
+import json
+import os
+import numpy as np
+
+# Manifest of rendered chart hashes kept beside the images
+MANIFEST_NAME = "charts_manifest.json"
+
+# Bump when the render functions change so cached images are redrawn
+STYLE_VERSION = 1
+
+
+class ImageOptions(NamedTuple):
+    """How a chart is encoded; the format follows the file extension (png, svg or webp).
+
+    ``max_width`` caps the width in pixels by lowering the DPI. With
+    ``optimize`` PNGs are quantized to a 256 color palette, which charts
+    with a handful of flat colors barely show.
+    """
+    dpi: Optional[float] = None
+    max_width: Optional[int] = None
+    optimize: bool = True
+    # WebP quality, 0-100
+    quality: int = 80
+
+
+class ChartJob(NamedTuple):
+    """An independent chart render: a module-level function drawing a figure from plain data, and its output."""
+    render: Callable
+    filename: str
+    data: dict
+    image: ImageOptions = ImageOptions()
+
+
+def new_figure(figsize):
+    # matplotlib is only imported by the processes that actually draw
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def save_figure(fig, filename: str, image: ImageOptions = ImageOptions()) -> str:
+    """Encode a figure to ``filename`` in the format of its extension."""
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    fig.tight_layout()
+    dpi = image.dpi or fig.get_dpi()
+    if image.max_width:
+        dpi = min(dpi, image.max_width / fig.get_figwidth())
+    if filename.endswith(".png") and image.optimize:
+        from PIL import Image
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=dpi)
+        with Image.open(buffer) as raw:
+            raw.convert("RGB").quantize(colors=256).save(filename, optimize=True)
+    elif filename.endswith(".webp"):
+        fig.savefig(filename, dpi=dpi, pil_kwargs={"quality": image.quality, "method": 6})
+    else:
+        fig.savefig(filename, dpi=dpi)
+    return filename
+
+
+def render_biweekly(periods: List[str], promised, delivered, percent_completed, title: str):
+    """Bars for promised/delivered issues with the completion percentage line."""
+    fig = new_figure((12, 5))
+    ax1 = fig.subplots()
+    bar_width = 0.4
+    x = range(len(periods))
+
+    # Bar chart for issues
+    ax1.bar([i - bar_width / 2 for i in x], promised, width=bar_width, label="Prometido", color="navy")
+    ax1.bar([i + bar_width / 2 for i in x], delivered, width=bar_width, label="Entregue", color="green")
+    ax1.set_ylabel("Issues", fontsize=12)
+    ax1.set_xticks(x)
+    ax1.set_xticklabels(periods, rotation=45)
+    ax1.tick_params(axis='y', labelsize=10)
+    ax1.legend(loc="upper left", fontsize=10)
+
+    # Line chart for completion percentage
+    ax2 = ax1.twinx()
+    ax2.plot(x, percent_completed, color="darkred", marker="o", linewidth=2, label="% Concluído")
+    ax2.set_ylabel("% Concluído", fontsize=12)
+    ax2.set_ylim(0, 110)
+    ax2.tick_params(axis='y', labelsize=10)
+    ax2.legend(loc="upper right", fontsize=10)
+
+    ax1.set_title(title, fontsize=14, pad=20)
+    return fig
+
+
+def render_burnup(periods: List[str], cumulative_promised, cumulative_delivered,
+                  trend: Optional[list], forecast_x: Optional[float], forecast_label: Optional[str],
+                  title: str):
+    """Cumulative promised vs delivered lines with optional trend and forecast marker."""
+    fig = new_figure((12, 5))
+    ax = fig.subplots()
+    x = range(len(periods))
+
+    # Plot the cumulative lines
+    ax.plot(x, cumulative_promised, label="Prometido acumulado", color="blue", marker="o", linewidth=2)
+    ax.plot(x, cumulative_delivered, label="Entregue acumulado", color="green", marker="o", linewidth=2)
+    ax.fill_between(x, cumulative_delivered, cumulative_promised, color="lightgray", alpha=0.3)
+
+    if trend is not None:
+        ax.plot(x, trend, linestyle="--", color="orange", label="Tendência", linewidth=2)
+    if forecast_x is not None:
+        ax.axvline(x=forecast_x, linestyle=":", color="red", label=forecast_label, linewidth=2)
+
+    ax.set_xticks(x)
+    ax.set_xticklabels(periods, rotation=45)
+    ax.set_xlabel("Período", fontsize=12)
+    ax.set_ylabel("Issues acumuladas", fontsize=12)
+    ax.set_title(title, fontsize=14, pad=20)
+    ax.legend(fontsize=10)
+    ax.grid(axis='y', linestyle='--', alpha=0.3)
+    return fig
+
+
+def render_wip(days: List[str], wip, title: str):
+    """Daily work in progress line with about ten date ticks."""
+    fig = new_figure((12, 5))
+    ax = fig.subplots()
+    x = np.arange(len(days))
+    ax.plot(x, wip, color="purple", linewidth=1.5, label="Issues abertas")
+    ax.fill_between(x, wip, color="purple", alpha=0.15)
+
+    ticks = x[::max(1, len(days) // 10)]
+    ax.set_xticks(ticks)
+    ax.set_xticklabels([days[i] for i in ticks], rotation=45)
+    ax.set_xlabel("Dia", fontsize=12)
+    ax.set_ylabel("WIP", fontsize=12)
+    ax.set_title(title, fontsize=14, pad=20)
+    ax.legend(fontsize=10)
+    ax.grid(axis='y', linestyle='--', alpha=0.3)
+    return fig
+
+
+def render_histogram(counts, edges, percentiles: List[tuple], color: str,
+                     xlabel: str, ylabel: str, title: str, figsize=(12, 5),
+                     tick_positions=None, tick_labels=None):
+    """Pre-binned histogram with vertical percentile markers ``(value, color, label)``."""
+    fig = new_figure(figsize)
+    ax = fig.subplots()
+    edges = np.asarray(edges)
+    ax.hist(edges[:-1], bins=edges, weights=counts, alpha=0.7, color=color, edgecolor='black', linewidth=0.5)
+
+    for value, line_color, label in percentiles:
+        ax.axvline(x=value, color=line_color, linestyle='--', linewidth=2, label=label)
+
+    if tick_positions is not None:
+        ax.set_xticks(tick_positions)
+        ax.set_xticklabels(tick_labels, rotation=45)
+
+    ax.set_title(title, fontsize=14, pad=20)
+    ax.set_xlabel(xlabel, fontsize=12)
+    ax.set_ylabel(ylabel, fontsize=12)
+    ax.grid(axis='y', linestyle='--', alpha=0.3)
+    ax.legend(fontsize=10)
+    return fig
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def job_hash(job: ChartJob) -> str:
+    """Hash a job's render function, input data, style parameters and image options."""
+    payload = json.dumps(
+        [STYLE_VERSION, job.render.__name__, job.data, job.image],
+        default=_json_default,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_manifest(directory: str) -> dict:
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(directory: str, manifest: dict):
+    os.makedirs(directory or ".", exist_ok=True)
+    with open(os.path.join(directory, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def render_chart(job: ChartJob) -> str:
+    # Drawing and encoding both happen in the worker
+    return save_figure(job.render(**job.data), job.filename, job.image)
+
+
+def render_charts(jobs: List[ChartJob], max_workers: Optional[int] = None, use_cache: bool = True) -> List[str]:
+    """Render independent chart jobs, in a process pool when there is more than one.
+
+    With ``use_cache`` a job is skipped when its image exists and its hash
+    matches the manifest entry written by a previous run, and the images of
+    a previous run that are not among ``jobs`` are removed.
+    """
+    hashes = {job.filename: job_hash(job) for job in jobs} if use_cache else {}
+    manifests = {}
+    pending = []
+    for job in jobs:
+        directory, name = os.path.split(job.filename)
+        manifest = manifests.setdefault(directory, load_manifest(directory) if use_cache else {})
+        if use_cache and manifest.get(name) == hashes[job.filename] and os.path.exists(job.filename):
+            continue
+        pending.append(job)
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(pending))
+    if max_workers <= 1:
+        for job in pending:
+            render_chart(job)
+    else:
+        # Each worker gets its share of the jobs in one batch instead of one round trip per chart
+        chunksize = -(-len(pending) // max_workers)
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(render_chart, pending, chunksize=chunksize))
+
+    if use_cache:
+        # The manifest only lists the current jobs; images of charts no longer drawn, such as a
+        # breakdown value that dropped out or another chart format, are deleted with their entry
+        current = {directory: {} for directory in manifests}
+        for job in jobs:
+            directory, name = os.path.split(job.filename)
+            current[directory][name] = hashes[job.filename]
+        removed = 0
+        for directory, manifest in current.items():
+            for name in set(manifests[directory]) - set(manifest):
+                stale = os.path.join(directory, name)
+                if os.path.exists(stale):
+                    os.remove(stale)
+                    removed += 1
+            if manifest != manifests[directory]:
+                save_manifest(directory, manifest)
+        if removed:
+            print(f"🧹 {removed} gráfico(s) obsoleto(s) removido(s).")
+    if len(pending) < len(jobs):
+        print(f"♻️ {len(jobs) - len(pending)} gráfico(s) sem alterações reaproveitado(s).")
+    return [job.filename for job in jobs]
@@ -0,0 +1,123 @@
+from typing import Tuple
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+# Share of a repository's contributions the bus factor developers must cover
+BUS_FACTOR_SHARE = 0.5
+
+
+def _row_sums(matrix: sparse.spmatrix) -> np.ndarray:
+    return np.asarray(matrix.sum(axis=1)).ravel()
+
+
+def interaction_matrix(edges: pd.DataFrame) -> Tuple[sparse.csr_matrix, pd.Index]:
+    """Directed developer-by-developer matrix of ``source -> target`` interaction weights.
+
+    ``edges`` has ``source``, ``target`` and ``weight`` columns; repeated
+    pairs (e.g. the same pair in several repositories) are summed.
+    """
+    codes, developers = pd.factorize(pd.concat([edges["source"], edges["target"]], ignore_index=True))
+    n_edges = len(edges)
+    n = len(developers)
+    matrix = sparse.coo_matrix(
+        (edges["weight"].to_numpy(dtype=np.float64), (codes[:n_edges], codes[n_edges:])), shape=(n, n)
+    ).tocsr()
+    matrix.sum_duplicates()
+    return matrix, pd.Index(developers, name="developer")
+
+
+def undirected(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    """Symmetric weights of ``matrix`` without self loops."""
+    adjacency = (matrix + matrix.T).tocsr()
+    adjacency.setdiag(0)
+    adjacency.eliminate_zeros()
+    return adjacency
+
+
+def pagerank(matrix: sparse.csr_matrix, damping: float = 0.85, tol: float = 1e-10,
+             max_iter: int = 200) -> np.ndarray:
+    """Weighted PageRank of a directed matrix by power iteration over sparse products."""
+    n = matrix.shape[0]
+    if n == 0:
+        return np.empty(0)
+    out_weight = _row_sums(matrix)
+    dangling = out_weight == 0
+    inverse = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+    # Column-stochastic transition matrix, so each step is a single sparse product
+    transition = (sparse.diags(inverse) @ matrix).T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        updated = damping * (transition @ rank + rank[dangling].sum() / n) + (1 - damping) / n
+        converged = np.abs(updated - rank).sum() < tol
+        rank = updated
+        if converged:
+            break
+    return rank
+
+
+def clustering(adjacency: sparse.csr_matrix) -> np.ndarray:
+    """Local clustering coefficient of each node of an undirected adjacency matrix."""
+    binary = (adjacency > 0).astype(np.float64)
+    degree = _row_sums(binary)
+    # Paths of length two that close back through an edge, counted twice per triangle
+    triangles = _row_sums(binary.multiply(binary @ binary)) / 2
+    possible = degree * (degree - 1) / 2
+    return np.divide(triangles, possible, out=np.zeros_like(degree), where=possible > 0)
+
+
+def developer_metrics(matrix: sparse.csr_matrix, developers: pd.Index) -> pd.DataFrame:
+    """Centrality and clustering of each developer, most central first."""
+    adjacency = undirected(matrix)
+    n = len(developers)
+    collaborators = np.diff(adjacency.indptr)
+    return pd.DataFrame({
+        "developer": developers,
+        "pagerank": pagerank(matrix),
+        "degree_centrality": collaborators / (n - 1) if n > 1 else np.zeros(n),
+        "collaborators": collaborators,
+        "interactions": _row_sums(adjacency).astype(np.int64),
+        "clustering": clustering(adjacency),
+    }).sort_values("pagerank", ascending=False, ignore_index=True)
+
+
+def network_summary(matrix: sparse.csr_matrix) -> dict:
+    """Size, density and connected components of the collaboration network."""
+    adjacency = undirected(matrix)
+    n = adjacency.shape[0]
+    connections = adjacency.nnz // 2
+    if n == 0:
+        return {'developers': 0, 'interactions': 0, 'connections': 0, 'density': 0.0,
+                'components': 0, 'largest_component': 0.0}
+    n_components, labels = connected_components(adjacency, directed=False)
+    return {
+        'developers': n,
+        'interactions': int(matrix.sum()),
+        'connections': connections,
+        'density': connections / (n * (n - 1) / 2) if n > 1 else 0.0,
+        'components': n_components,
+        'largest_component': np.bincount(labels).max() / n,
+    }
+
+
+def bus_factor(contributions: pd.DataFrame, share: float = BUS_FACTOR_SHARE) -> pd.DataFrame:
+    """Fewest developers covering ``share`` of each repository's contributions.
+
+    ``contributions`` has ``repository``, ``login`` and ``contributions``
+    columns with one row per developer and repository.
+    """
+    df = contributions.sort_values(["repository", "contributions"], ascending=[True, False], ignore_index=True)
+    grouped = df.groupby("repository", sort=True)["contributions"]
+    total = grouped.transform("sum")
+    # A developer is needed while the ones ranked before them cover less than the share
+    covered_before = (grouped.cumsum() - df["contributions"]) / total
+    df["needed"] = covered_before < share
+    top = df.groupby("repository", sort=True).first()
+    return pd.DataFrame({
+        "repository": top.index,
+        "bus_factor": df.groupby("repository", sort=True)["needed"].sum().to_numpy(),
+        "contributors": grouped.size().to_numpy(),
+        "top_contributor": top["login"].to_numpy(),
+        "top_share": (top["contributions"] / grouped.sum()).to_numpy() * 100,
+    }).sort_values(["bus_factor", "repository"], ignore_index=True)
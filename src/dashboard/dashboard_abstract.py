@@ -1,36 +1,208 @@
-from pydantic import BaseModel, field_validator, model_validator
-from typing import List, Any
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
+import threading
+import time
+from pathlib import Path
 from dotenv import load_dotenv
-import airbyte as ab
+from .sync_store import SnapshotStore, SyncStore, checkpoints, cursor_field
+from .repositories import core_rate_limit_delay, resolve_repositories, wait_for_rate_limit
+from .instrumentation import Instrumentation
+
+# Installing/resolving the connector is not safe to run from several threads at once
+_source_lock = threading.Lock()
 
 class AbstractDasboard(BaseModel):
     streams: List[str]
     repository: str = ""
+    repositories: List[str] = []
     token: str = ""
     cache: Any = None
+    incremental: bool = True
+    store_path: str = ".cache/reportify/reportify.duckdb"
+    sync_batch_size: int = 5000
+    max_workers: int = 4
+    min_rate_limit: int = 100
+    # Retries of a failed repository sync, resuming from its checkpoints after a growing pause
+    fetch_retries: int = 3
+    retry_backoff: float = 30.0
+    # Pinned source-github version and where its virtualenv is installed (cached between runs)
+    connector_version: Optional[str] = None
+    connector_dir: str = ".cache/reportify/connectors"
+    instrumentation: Instrumentation = Field(default_factory=Instrumentation)
+    metrics_json: str = "metrics.json"
+    metrics_openmetrics: str = "metrics.prom"
+    # Never fetch: rebuild from the existing store, or from snapshot_dir when set
+    offline: bool = False
+    snapshot_dir: Optional[str] = None
 
     def model_post_init(self, __context):
         load_dotenv()
-        self.repository = os.getenv("REPOSITORY", "")
-        self.token = os.getenv("TOKEN", "")
+        self.repository = os.getenv("REPOSITORY", self.repository)
+        self.token = os.getenv("TOKEN", self.token)
+
+    def load_cache(self):
+        """Return the data store, fetching it on first access unless offline."""
+        if self.cache is not None:
+            return self.cache
+        if self.snapshot_dir or self.offline:
+            store = SnapshotStore(directory=self.snapshot_dir) if self.snapshot_dir else SyncStore(path=self.store_path)
+            if not all(store.has_stream(stream) for stream in self.streams):
+                raise RuntimeError(f"Dados offline incompletos para {', '.join(self.streams)}")
+            if not self.repositories:
+                # Globs and owner names are matched against what the offline data holds
+                self.repositories = resolve_repositories(self.repository, self.token, store.repositories(self.streams[0]))
+            self.cache = store
+            return self.cache
+        if not self.repositories:
+            self.repositories = resolve_repositories(self.repository, self.token)
         self.fetch_data()
+        if self.cache is None:
+            raise RuntimeError(f"Nenhum dado disponível para {self.repository}")
+        return self.cache
+
+    def save_snapshot(self, directory: str):
+        """Write every stream of the store to ``<directory>/<stream>.parquet`` for offline runs."""
+        store = self.load_cache()
+        for stream in self.streams:
+            store.export_parquet(stream, os.path.join(directory, f"{stream}.parquet"))
+        print(f"✅ Snapshot salvo em {directory}")
+
+    def save_metrics(self):
+        """Save per-stage instrumentation next to the markdown report."""
+        self.instrumentation.save_json(self.metrics_json)
+        self.instrumentation.save_openmetrics(self.metrics_openmetrics)
+        print(f"✅ Métricas de execução salvas em {self.metrics_json} e {self.metrics_openmetrics}")
 
     def fetch_data(self):
-        print(f"🔄 Buscando issues para {self.repository}...")
-        try:
-            source = ab.get_source(
+        print(f"🔄 Buscando {', '.join(self.streams)} para {len(self.repositories)} repositório(s): {self.repository}...")
+        store = SyncStore(path=self.store_path)
+        failed = 0
+        with self.instrumentation.stage("fetch") as stage, ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            stage.rows = 0
+            futures = {pool.submit(self.sync_with_retries, store, repo): repo for repo in self.repositories}
+            for future in as_completed(futures):
+                try:
+                    stage.rows += future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"❌ Erro ao buscar {futures[future]}: {str(e)}")
+                # Runs while the other repositories are still downloading
+                self.repository_synced(store, futures[future])
+        if failed < len(self.repositories):
+            self.cache = store
+
+    def repository_synced(self, store: SyncStore, repository: str):
+        """Hook called as each repository finishes syncing (or fails), before the whole fetch is done."""
+
+    def sync_with_retries(self, store: SyncStore, repository: str) -> int:
+        """Sync one repository, retrying from the last checkpoint when the sync fails.
+
+        Returns the records synced by every attempt, including the batches
+        checkpointed by the attempts that failed.
+        """
+        synced = {}
+        for attempt in range(self.fetch_retries + 1):
+            try:
+                # Only the first attempt may clear the repository, retries resume from the checkpoints
+                return self.sync_repository(store, repository, full_refresh=not self.incremental and attempt == 0,
+                                            synced=synced)
+            except Exception as e:
+                if attempt == self.fetch_retries:
+                    raise
+                # Wait for the rate limit reset when the budget is gone, otherwise back off exponentially
+                delay = max(core_rate_limit_delay(self.token, self.min_rate_limit), self.retry_backoff * 2 ** attempt)
+                print(f"⚠️ Falha ao buscar {repository} ({str(e)}), retomando do último checkpoint em {int(delay)}s...")
+                time.sleep(delay)
+
+    def source_groups(self, cursors: dict) -> List[tuple]:
+        """``(start_date, streams)`` pairs, one source per group.
+
+        A single source serves every stream that has a cursor, starting from
+        the oldest one; streams never synced need a source without start date.
+        """
+        synced = [stream for stream in self.streams if cursors[stream]]
+        pending = [stream for stream in self.streams if not cursors[stream]]
+        groups = []
+        if synced:
+            groups.append((min(cursors[stream] for stream in synced), synced))
+        if pending:
+            groups.append((None, pending))
+        return groups
+
+    def sync_repository(self, store: SyncStore, repository: str, full_refresh: bool = False,
+                        synced: Optional[Dict[str, int]] = None) -> int:
+        """Fetch the selected streams of one repository changed since their cursors.
+
+        Streams in ``CHECKPOINT_STREAMS`` save their cursor after every batch,
+        so an interrupted sync resumes from the last batch written. ``synced``
+        counts the records per stream as their cursor is saved, so it carries
+        over the attempts of ``sync_with_retries``.
+        """
+        synced = {} if synced is None else synced
+        if full_refresh:
+            for stream in self.streams:
+                store.clear(stream, repository)
+
+        cursors = {stream: store.get_cursor(stream, repository) for stream in self.streams}
+        for start_date, streams in self.source_groups(cursors):
+            config = {
+                "repositories": [repository],
+                "credentials": {"personal_access_token": self.token},
+            }
+            if start_date:
+                config["start_date"] = start_date
+
+            wait_for_rate_limit(self.token, self.min_rate_limit)
+            source = self.get_source(config)
+            source.check()
+
+            for stream in streams:
+                cursor = cursors[stream]
+                # Records written since the last saved cursor; a retry fetches them again otherwise
+                count = 0
+                batch = []
+                for record in source.get_records(stream):
+                    batch.append(record)
+                    if len(batch) >= self.sync_batch_size:
+                        cursor = self._write_batch(store, stream, repository, batch, cursor)
+                        count += len(batch)
+                        batch = []
+                        if checkpoints(stream):
+                            store.set_cursor(stream, repository, cursor)
+                            synced[stream] = synced.get(stream, 0) + count
+                            count = 0
+                        # Pause reading (and so the connector) while the API budget is low
+                        wait_for_rate_limit(self.token, self.min_rate_limit)
+                cursor = self._write_batch(store, stream, repository, batch, cursor)
+                count += len(batch)
+                store.set_cursor(stream, repository, cursor)
+                synced[stream] = synced.get(stream, 0) + count
+                print(f"✅ {stream}: {synced[stream]} registros sincronizados para {repository}.")
+        return sum(synced.values())
+
+    def get_source(self, config: dict):
+        """Create the source-github connector, reusing the virtualenv under ``connector_dir``."""
+        # Imported here so commands that never fetch skip airbyte's import cost
+        import airbyte as ab
+        with _source_lock:
+            return ab.get_source(
                 "source-github",
+                config=config,
+                version=self.connector_version,
                 install_if_missing=True,
-                config={
-                    "repositories": [self.repository],
-                    "credentials": {"personal_access_token": self.token},
-                },
+                install_root=Path(self.connector_dir),
             )
-            source.check()
-            source.select_streams(self.streams)
-            cache = ab.get_default_cache()
-            source.read(cache=cache)
-            self.cache = cache
-        except Exception as e:
-            print(f"❌ Erro ao buscar: {str(e)}")
+
+    def _write_batch(self, store: SyncStore, stream: str, repository: str,
+                     batch: list, cursor: Optional[str]) -> Optional[str]:
+        """Upsert a batch of records and return the advanced cursor."""
+        if not batch:
+            return cursor
+        frame = store.records_to_frame(batch, repository)
+        store.upsert(stream, frame)
+        field = cursor_field(stream)
+        if field in frame.columns and frame[field].notna().any():
+            cursor = max(filter(None, [cursor, frame[field].max()]))
+        return cursor
@@ -0,0 +1,151 @@
+from .dashboard_abstract import AbstractDasboard
+from typing import List
+import pandas as pd
+from .collaboration_graph import interaction_matrix, developer_metrics, network_summary, bus_factor
+from .report_builder import MarkdownReport, markdown_table
+
+# Issue comments and pull request reviews point back to their issue/PR by URL
+ACTIVITY_STREAMS = {
+    "comments": "issue_url",
+    "reviews": "pull_request_url",
+}
+
+COLLABORATION_HEADER = """# 🤝 Colaboração entre Desenvolvedores
+
+| 👩‍💻 Desenvolvedores | 💬 Interações | 🔗 Conexões | 🕸️ Densidade | 🧩 Componentes | 🏝️ Maior componente |
+|-----------------|-------------|------------|-------------|---------------|--------------------|
+| {developers} | {interactions} | {connections} | {density:.3f} | {components} | {largest_component_percent:.1f}% |
+
+"""
+
+CENTRALITY_TABLE = """## 🌟 Desenvolvedores Mais Centrais
+
+| Desenvolvedor | PageRank | Colaboradores | Interações | Coef. de Agrupamento |
+|---------------|----------|---------------|------------|----------------------|
+"""
+
+BUS_FACTOR_TABLE = """## 🚌 Bus Factor por Repositório
+
+Menor número de desenvolvedores responsáveis por metade das contribuições (issues, comentários e revisões).
+
+| Repositório | Bus Factor | Contribuidores | Principal Contribuidor | % do Principal |
+|-------------|------------|----------------|------------------------|----------------|
+"""
+
+
+class CollaborationDashboard (AbstractDasboard):
+    streams: List[str] = ["issues", "comments", "reviews"]
+    # Developers listed in the centrality table
+    top_developers: int = 20
+    metrics_json: str = "collaboration_metrics.json"
+    metrics_openmetrics: str = "collaboration_metrics.prom"
+
+    def _activity_sql(self) -> str:
+        """Union of (repository, number, login) rows of the activity streams present in the store."""
+        store = self.load_cache()
+        parts = [
+            f"""SELECT repository, regexp_extract({url}, '/(\\d+)$', 1) AS number,
+                       json_extract_string("user", '$.login') AS login
+                FROM {stream}"""
+            for stream, url in ACTIVITY_STREAMS.items() if store.has_stream(stream)
+        ]
+        return " UNION ALL ".join(parts)
+
+    def load_interactions(self) -> pd.DataFrame:
+        """Weighted ``source -> target`` edges: who commented on or reviewed whose issue or PR."""
+        activity = self._activity_sql()
+        if not activity:
+            return pd.DataFrame({"source": [], "target": [], "weight": []})
+        # Joined and counted inside the store, so only one row per developer pair reaches pandas
+        sql = f"""
+            WITH activity AS ({activity}),
+            authors AS (
+                SELECT repository, number, json_extract_string("user", '$.login') AS author FROM issues
+            )
+            SELECT activity.login AS source, authors.author AS target, count(*) AS weight
+            FROM activity JOIN authors USING (repository, number)
+            WHERE activity.login IS NOT NULL AND authors.author IS NOT NULL
+              AND activity.login <> authors.author
+              AND (len(?) = 0 OR list_contains(?, activity.repository))
+            GROUP BY ALL
+        """
+        return self.load_cache().query(sql, [self.repositories, self.repositories])
+
+    def load_contributions(self) -> pd.DataFrame:
+        """Issues, comments and reviews authored by each developer in each repository."""
+        activity = self._activity_sql()
+        authored = 'SELECT repository, number, json_extract_string("user", \'$.login\') AS login FROM issues'
+        sql = f"""
+            SELECT repository, login, count(*) AS contributions
+            FROM ({" UNION ALL ".join(filter(None, [authored, activity]))})
+            WHERE login IS NOT NULL AND (len(?) = 0 OR list_contains(?, repository))
+            GROUP BY ALL
+        """
+        return self.load_cache().query(sql, [self.repositories, self.repositories])
+
+    def generate_markdown_header(self, summary: dict) -> str:
+        return COLLABORATION_HEADER.format(
+            largest_component_percent=summary['largest_component'] * 100, **summary
+        )
+
+    def generate_centrality_section(self, developers: pd.DataFrame) -> str:
+        return markdown_table(CENTRALITY_TABLE, developers.head(self.top_developers), {
+            "developer": "%s",
+            "pagerank": "%.4f",
+            "collaborators": "%d",
+            "interactions": "%d",
+            "clustering": "%.2f",
+        }) + "\n"
+
+    def generate_bus_factor_section(self, bus: pd.DataFrame) -> str:
+        return markdown_table(BUS_FACTOR_TABLE, bus, {
+            "repository": "%s",
+            "bus_factor": "%d",
+            "contributors": "%d",
+            "top_contributor": "%s",
+            "top_share": "%.1f%%",
+        }) + "\n"
+
+    def analyze(self) -> dict:
+        """Build the interaction graph and compute every collaboration metric."""
+        stage = self.instrumentation.stage
+
+        with stage("interactions") as metrics:
+            edges = self.load_interactions()
+            contributions = self.load_contributions()
+            metrics.rows = len(edges)
+
+        with stage("graph_metrics") as metrics:
+            matrix, developers = interaction_matrix(edges)
+            summary = network_summary(matrix)
+            developer_stats = developer_metrics(matrix, developers)
+            bus = bus_factor(contributions)
+            metrics.rows = len(developers)
+        print(f"🤝 Rede de colaboração: {summary['developers']} desenvolvedores, {summary['connections']} conexões.")
+
+        return {
+            'summary': summary,
+            'developers': developer_stats,
+            'bus_factor': bus,
+        }
+
+    def save_markdown(self, markdown: str, filename: str = "collaboration_stats.md"):
+        """Save markdown report to file."""
+        with open(filename, "w") as f:
+            f.write(markdown)
+        print(f"✅ Markdown salvo em {filename}")
+
+    def run(self):
+        results = self.analyze()
+
+        with self.instrumentation.stage("report") as metrics:
+            report = MarkdownReport()
+            report.write(
+                self.generate_markdown_header(results['summary']),
+                self.generate_centrality_section(results['developers']),
+                self.generate_bus_factor_section(results['bus_factor']),
+            )
+            self.save_markdown(report.getvalue())
+            metrics.rows = report.lines
+
+        self.save_metrics()
@@ -1,25 +1,250 @@
 from .dashboard_abstract import AbstractDasboard
-from typing import List, Any
+from .sync_store import SyncStore
+from typing import Iterator, List, Any, Optional
+from pydantic import Field, field_validator, model_validator
+import json
 import pandas as pd
-import random
 import numpy as np
-import matplotlib.pyplot as plt
+from .charts import ChartJob, ImageOptions, render_biweekly, render_burnup, render_histogram, render_wip, render_charts
+from .monte_carlo import ForecastInput, forecast, forecast_many, order_statistic
+from .breakdowns import DIMENSIONS, count_by_slice, slug
+from .flow_metrics import (
+    day_numbers, event_counts, merge_counts, lead_times, daily_wip, throughput_by_period, summarize_lead_times
+)
+from .report_builder import MarkdownReport, key_value_table, markdown_table
+from .history import ORGANIZATION, HistoryStore, backtest, backtest_summary
+from .exporters import EXPORTERS, export_tables
+
+ORGANIZATION_HEADER = """# 📈 GitHub Issue Stats - Organização
+
+| 🟢 Abertas | 🔴 Fechadas | 📦 Total | ✅ % Fechadas |
+|----------|------------|---------|------------|
+| {open} | {closed} | {total} | {percent_closed}% |
+
+"""
+
+STATE_TABLE = """| {title} | 🟢 Abertas | 🔴 Fechadas | 📦 Total | ✅ % Fechadas |
+|{rule}|----------|------------|---------|------------|
+"""
+
+# Cell formats of the per-repository and per-slice tables, after their first column
+STATE_COLUMNS = {"open": "%d", "closed": "%d", "total": "%d", "percent_closed": "%.1f%%"}
+
+WEEKLY_TABLE = """| Período | Prometido | Entregue | % Concluído | Velocidade |
+|--------|------------|----------|--------------|------------|
+"""
+
+METRIC_TABLE = """| Métrica | Valor |
+|--------|-------|
+"""
+
+TEAM_FORECAST_TABLE = """### 🎯 Previsões por {title}
+
+| Equipe | Restante | Velocidade P50 | Conclusão P10 | Conclusão P50 | Conclusão P90 | Simulações |
+|--------|----------|----------------|---------------|---------------|---------------|------------|
+"""
+
+MONTE_CARLO_EXPLANATION = """### Explicação da Simulação Monte Carlo
+
+| Conceito | Explicação |
+|---------|------------|
+| **O que é Monte Carlo?** | Técnica estatística que utiliza amostragens aleatórias repetidas para obter resultados numéricos e estimar probabilidades. |
+| **Como funciona a simulação?** | 1) Coletamos o histórico de velocidade da organização (issues concluídas/semana)<br>2) Fazemos {trials} simulações com variações aleatórias dessas velocidades<br>3) Para cada simulação, calculamos quando o trabalho restante seria concluído<br>4) Organizamos os resultados e calculamos os percentis |
+| **O que significa P10?** | Cenário otimista. Existe apenas 10% de chance de concluir o trabalho antes desta data. É um resultado rápido e favorável, mas menos provável. |
+| **O que significa P50?** | Cenário mais provável. 50% de chance de terminar antes ou depois desta data. É nossa melhor estimativa 'realista'. |
+| **O que significa P90?** | Cenário conservador. Existe 90% de chance de concluir antes desta data. Útil para planejamento seguro, pois é improvável atrasar além deste ponto. |
+| **Por que usar Monte Carlo?** | Fornece intervalos de confiança em vez de datas únicas, reconhecendo a incerteza natural no desenvolvimento. Captura a variabilidade histórica da organização. |
+| **Como interpretar velocidades?** | Quanto maior a velocidade, mais rápido a organização conclui issues. P10/P50/P90 para velocidades mostram diferentes cenários de produtividade que usamos nos cálculos. |
+"""
+
+# Issue fields parsed by the store, and fields loaded as categoricals since few distinct
+# values (states, repositories, assignee/label/milestone JSON) repeat over many issues
+ISSUE_CASTS = {"created_at": "TIMESTAMP", "closed_at": "TIMESTAMP"}
+ISSUE_CATEGORIES = ["repository", "state", "assignees", "labels", "milestone"]
+
+
+def sorted_categories(values: pd.Series) -> pd.Series:
+    """Categorical with sorted categories, so groupbys order keys the same whatever the load order."""
+    values = values.astype("category")
+    return values.cat.reorder_categories(values.cat.categories.sort_values())
+
+
+def period_start(created_at: pd.Series) -> pd.Series:
+    """Start of the 2W period of each timestamp, i.e. the Monday of its week in UTC."""
+    # Same value as dt.to_period("2W").start_time, without a Python call per row
+    day = created_at.dt.tz_convert(None).dt.floor("D")
+    return (day - pd.to_timedelta(day.dt.dayofweek, unit="D")).rename("period")
+
+
+def state_columns(grouped: pd.DataFrame) -> pd.DataFrame:
+    """Add the ``open`` or ``closed`` count column a table pivoted by state may lack."""
+    for col in ["open", "closed"]:
+        if col not in grouped.columns:
+            grouped[col] = 0
+    return grouped
+
+
+def delivery_columns(grouped: pd.DataFrame) -> pd.DataFrame:
+    """Add promised, delivered and percent_completed to a table of open/closed counts.
+
+    Shared by the organization, slice and team tables so they always agree.
+    """
+    grouped["promised"] = grouped["open"] + grouped["closed"]
+    grouped["delivered"] = grouped["closed"]
+    grouped["percent_completed"] = (grouped["closed"] / grouped["promised"]).fillna(0) * 100
+    return grouped
 
 class OrganizationalDashboard (AbstractDasboard):
     streams: List[str] = ["issues"]
     issues_df: Any = None
-    monte_carlo_simulations:int = 1000
+    # Per-batch counts every analysis stage is reduced from (see batch_partials)
+    partials: Optional[List[dict]] = None
+    # While fetching, aggregate each repository as soon as its sync finishes
+    pipeline: bool = True
+    monte_carlo_simulations:int = 100_000
+    monte_carlo_seed: Optional[int] = None
+    # Adaptive mode: simulate in batches until the P10/P50/P90 dates move by at most this many
+    # days between batches, with monte_carlo_simulations as the upper bound (None = fixed count)
+    monte_carlo_tolerance_days: Optional[float] = Field(None, gt=0)
+    monte_carlo_batch_size: int = Field(5_000, gt=0)
+    # Sample only the last N periods and/or weight periods so they count half as much every
+    # velocity_half_life periods back (None = every period, uniformly)
+    velocity_window: Optional[int] = Field(None, gt=0)
+    velocity_half_life: Optional[float] = Field(None, gt=0)
     output_dir:str = "organization_charts"
+    render_workers: Optional[int] = None
+    chart_cache: bool = True
+    # Chart image format ("png", "svg" or "webp"), width cap in pixels and PNG palette optimization
+    chart_format: str = "png"
+    chart_max_width: Optional[int] = None
+    chart_optimize: bool = True
+    # Only these issue fields are loaded from the store
+    issue_columns: List[str] = ["repository", "state", "created_at", "closed_at", "assignees", "labels", "milestone"]
+    # When set, issues are aggregated in batches of this many rows instead of kept in memory
+    issue_chunk_size: Optional[int] = None
+    # "sql" pushes the biweekly aggregation into the store, "python" computes it with pandas
+    aggregation_backend: str = "sql"
+    # Slices of the breakdown section (see breakdowns.DIMENSIONS) and how many values each shows
+    breakdown_dimensions: List[str] = ["assignee", "label", "milestone"]
+    breakdown_top: int = 10
+    # Per-team forecasts: "repository", a breakdown dimension, or None to skip them
+    forecast_by: Optional[str] = "repository"
+    forecast_workers: Optional[int] = None
+    # When set, every run appends its stats, periods and forecasts to a HistoryStore here
+    history_dir: Optional[str] = None
+    metrics_json: str = "organization_metrics.json"
+    metrics_openmetrics: str = "organization_metrics.prom"
+    # Formats of exporters.EXPORTERS the results are also written in, one file per table in export_dir
+    export_formats: List[str] = []
+    export_dir: str = "organization_data"
+
+    @field_validator("export_formats")
+    @classmethod
+    def check_export_formats(cls, formats: List[str]) -> List[str]:
+        # Checked up front rather than after the sync, analysis and charts
+        unknown = [fmt for fmt in formats if fmt not in EXPORTERS]
+        if unknown:
+            raise ValueError(f"unknown export format(s) {', '.join(unknown)}; choose from {', '.join(EXPORTERS)}")
+        return formats
+
+    @model_validator(mode="after")
+    def check_forecast_by(self):
+        # Teams are repositories or the slices of a dimension the breakdowns count
+        if self.forecast_by not in (None, "repository", *self.breakdown_dimensions):
+            raise ValueError(f"forecast_by must be None, 'repository' or one of {self.breakdown_dimensions}, "
+                             f"not {self.forecast_by!r}")
+        return self
     
-    def model_post_init(self, __context):
-        super().model_post_init(__context)
-        self.issues_df = self.cache["issues"].to_pandas()
+    def load_issues(self) -> Optional[pd.DataFrame]:
+        """Load the issues on first access; stays None when aggregating in batches."""
+        if self.issues_df is None and self.issue_chunk_size is None:
+            cache = self.load_cache()
+            with self.instrumentation.stage("load") as stage:
+                self.issues_df = self.prepare_issues(cache.to_pandas("issues", **self.issue_query()))
+                stage.rows = len(self.issues_df)
+        return self.issues_df
+
+    def issue_query(self) -> dict:
+        """Store options loading the selected repositories' issues already in compact dtypes."""
+        return {
+            "columns": self.issue_columns,
+            "casts": ISSUE_CASTS,
+            "categories": ISSUE_CATEGORIES,
+            "repositories": self.repositories,
+        }
+
+    def prepare_issues(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Filter an issues frame to the selected repositories and apply compact dtypes.
+
+        Frames from ``issue_query`` already have them; raw text frames are converted here.
+        """
+        # The store may hold repositories from earlier runs; keep only the selected ones
+        if self.repositories:
+            df = df[df["repository"].isin(self.repositories)]
+        df = df.assign(
+            created_at=pd.to_datetime(df["created_at"], utc=True, format="ISO8601"),
+            closed_at=pd.to_datetime(df["closed_at"], utc=True, format="ISO8601"),
+            state=sorted_categories(df["state"]),
+            repository=sorted_categories(df["repository"]),
+        )
+        return df.reset_index(drop=True)
+
+    def issue_batches(self) -> Iterator[pd.DataFrame]:
+        """Yield the loaded issues, or stream them from the store in bounded-size batches."""
+        if self.load_issues() is not None:
+            yield self.issues_df
+            return
+        for batch in self.load_cache().iter_batches("issues", batch_size=self.issue_chunk_size, **self.issue_query()):
+            yield self.prepare_issues(batch)
+
+    def batch_partials(self, batch: pd.DataFrame) -> dict:
+        """Every count the analysis stages need from one batch, in a single pass over it."""
+        period = period_start(batch["created_at"])
+        is_closed = batch["closed_at"].notna()
+        created_at = batch["created_at"]
+        closed_at = batch["closed_at"][is_closed]
+        return {
+            'counts': batch.groupby([batch["repository"], period, batch["state"]], observed=True).size(),
+            'opened': event_counts(day_numbers(created_at)),
+            'closed': event_counts(day_numbers(closed_at)),
+            'lead_times': lead_times(created_at[is_closed], closed_at),
+            'slices': count_by_slice(batch, period, self.breakdown_dimensions),
+        }
+
+    def issue_partials(self) -> List[dict]:
+        """Partials of every batch, unless the fetch already computed them repository by repository."""
+        self.load_cache()
+        if not self.partials:
+            self.partials = [self.batch_partials(batch) for batch in self.issue_batches()]
+        return self.partials
+
+    def repository_synced(self, store: SyncStore, repository: str):
+        """Compute the partials of a synced repository while the others are still downloading."""
+        if not self.pipeline or not store.has_stream("issues"):
+            return
+        query = dict(self.issue_query(), repositories=[repository])
+        if self.issue_chunk_size is None:
+            batches = [store.to_pandas("issues", **query)]
+        else:
+            batches = store.iter_batches("issues", batch_size=self.issue_chunk_size, **query)
+        self.partials = (self.partials or []) + [self.batch_partials(self.prepare_issues(batch)) for batch in batches]
 
+    def count_issues(self, levels: List[str]) -> pd.DataFrame:
+        """Count issues by ``levels`` (``repository`` and/or ``period``) and state, summed over batches."""
+        counts = pd.concat([partial['counts'] for partial in self.issue_partials()]).reset_index(name="issues")
+        # Each batch, or repository synced on its own, brings its own categories, which concat turns into
+        # objects; recategorize so every way of loading the issues gives the same frame
+        counts["repository"] = sorted_categories(counts["repository"].astype(str))
+        grouped = counts.groupby(levels + ["state"], observed=True)["issues"].sum().unstack(fill_value=0)
+        grouped.columns = grouped.columns.astype(str)
+        return state_columns(grouped)
     
     def compute_stats(self) -> dict:
         """Compute overall organization stats."""
         # Group all issues by state
-        state_counts = self.issues_df['state'].value_counts().to_dict()
+        state_counts = pd.concat(
+            [partial['counts'] for partial in self.issue_partials()]
+        ).groupby(level="state", observed=True).sum().to_dict()
         
         # Ensure we have open and closed counts
         open_count = state_counts.get('open', 0)
@@ -36,54 +261,38 @@ class OrganizationalDashboard (AbstractDasboard):
             'percent_closed': percent_closed
         }
 
+    def compute_repository_stats(self) -> pd.DataFrame:
+        """Compute per-repository stats in a single groupby."""
+        grouped = self.count_issues(["repository"])
+        grouped["total"] = grouped["open"] + grouped["closed"]
+        grouped["percent_closed"] = (grouped["closed"] / grouped["total"] * 100).fillna(0).round(1)
+        return grouped[["open", "closed", "total", "percent_closed"]].sort_values("total", ascending=False).reset_index()
+
+    def generate_repository_section(self, repo_stats: pd.DataFrame) -> str:
+        header = "## 📦 Issues por Repositório\n\n" + STATE_TABLE.format(title="Repositório", rule="-------------")
+        return markdown_table(header, repo_stats, {"repository": "%s", **STATE_COLUMNS}) + "\n"
+
     def generate_markdown_header(self, stats: dict) -> str:
-        markdown = "# 📈 GitHub Issue Stats - Organização\n\n"
-        markdown += "| 🟢 Abertas | 🔴 Fechadas | 📦 Total | ✅ % Fechadas |\n"
-        markdown += "|----------|------------|---------|------------|\n"
-        markdown += f"| {stats['open']} | {stats['closed']} | {stats['total']} | {stats['percent_closed']}% |\n\n"
-        return markdown
-
-    def plot_weekly_delivery(self, weekly_data: pd.DataFrame):
-        """Create biweekly delivery chart for the entire organization."""
-        filename = f"{self.output_dir}/organization_biweekly.png"
-        
-        periods = weekly_data["period"].dt.strftime("%Y-%m-%d")
-        promised = weekly_data["promised"]
-        delivered = weekly_data["delivered"]
-        percent_completed = weekly_data["percent_completed"].round(1)
-        
-        fig, ax1 = plt.subplots(figsize=(12, 5))
-        bar_width = 0.4
-        x = range(len(periods))
-        
-        # Bar chart for issues
-        ax1.bar([i - bar_width / 2 for i in x], promised, width=bar_width, label="Prometido", color="navy")
-        ax1.bar([i + bar_width / 2 for i in x], delivered, width=bar_width, label="Entregue", color="green")
-        ax1.set_ylabel("Issues", fontsize=12)
-        ax1.set_xticks(x)
-        ax1.set_xticklabels(periods, rotation=45)
-        ax1.tick_params(axis='y', labelsize=10)
-        ax1.legend(loc="upper left", fontsize=10)
-        
-        # Line chart for completion percentage
-        ax2 = ax1.twinx()
-        ax2.plot(x, percent_completed, color="darkred", marker="o", linewidth=2, label="% Concluído")
-        ax2.set_ylabel("% Concluído", fontsize=12)
-        ax2.set_ylim(0, 110)
-        ax2.tick_params(axis='y', labelsize=10)
-        ax2.legend(loc="upper right", fontsize=10)
-        
-        plt.title("📊 Entregas Quinzenais da Organização", fontsize=14, pad=20)
-        plt.tight_layout()
-        plt.savefig(filename)
-        plt.close()
-        
-        return filename
-
-    def plot_burnup_chart(self, weekly_data: pd.DataFrame):
-        """Create burnup chart for the entire organization."""
-        filename = f"{self.output_dir}/organization_burnup.png"
-        
+        return ORGANIZATION_HEADER.format(**stats)
+
+    def chart_job(self, render, name: str, data: dict) -> ChartJob:
+        """A chart named ``name`` in ``output_dir``, encoded in ``chart_format``."""
+        image = ImageOptions(max_width=self.chart_max_width, optimize=self.chart_optimize)
+        return ChartJob(render, f"{self.output_dir}/{name}.{self.chart_format}", data, image)
+
+    def weekly_delivery_job(self, weekly_data: pd.DataFrame, name: str = "organization_biweekly",
+                            title: str = "📊 Entregas Quinzenais da Organização") -> ChartJob:
+        """Prepare the biweekly delivery chart for the entire organization, or for one slice of it."""
+        return self.chart_job(render_biweekly, name, {
+            'periods': weekly_data["period"].dt.strftime("%Y-%m-%d").tolist(),
+            'promised': weekly_data["promised"].tolist(),
+            'delivered': weekly_data["delivered"].tolist(),
+            'percent_completed': weekly_data["percent_completed"].round(1).tolist(),
+            'title': title,
+        })
+
+    def burnup_chart_job(self, weekly_data: pd.DataFrame):
+        """Prepare the burnup chart for the entire organization."""
         # Sort by period and calculate cumulative metrics
         df = weekly_data.sort_values("period")
         df["cumulative_promised"] = df["promised"].cumsum()
@@ -91,20 +300,15 @@ class OrganizationalDashboard (AbstractDasboard):
         
         # Convert periods to list for proper indexing
         periods_list = df["period"].dt.strftime("%Y-%m-%d").tolist()
-        x = range(len(periods_list))
-        
-        plt.figure(figsize=(12, 5))
-        
-        # Plot the cumulative lines
-        plt.plot(x, df["cumulative_promised"], label="Prometido acumulado", color="blue", marker="o", linewidth=2)
-        plt.plot(x, df["cumulative_delivered"], label="Entregue acumulado", color="green", marker="o", linewidth=2)
-        plt.fill_between(x, df["cumulative_delivered"], df["cumulative_promised"], color="lightgray", alpha=0.3)
+        trend_values = None
+        forecast_x = None
+        forecast_label = None
         
         # Add trend line and projection if we have enough data
         if len(df) >= 2:
             z = pd.Series(df["cumulative_delivered"].values).interpolate(method='linear')
             trend = pd.Series(z).rolling(window=2, min_periods=1).mean()
-            plt.plot(x, trend, linestyle="--", color="orange", label="Tendência", linewidth=2)
+            trend_values = trend.tolist()
             
             total_prometido = df["cumulative_promised"].max()
             if trend.iloc[-1] > 0 and len(trend) >= 2:
@@ -117,253 +321,317 @@ class OrganizationalDashboard (AbstractDasboard):
                         predicted_date = last_period_date + pd.Timedelta(days=int(periods_to_finish * 14))
                         predicted_date_str = predicted_date.strftime('%Y-%m-%d')
                         
-                        # Add vertical line at prediction
-                        future_x = len(periods_list) - 1 + periods_to_finish
-                        plt.axvline(x=future_x, linestyle=":", color="red", 
-                                   label=f"Previsão: {predicted_date_str}", linewidth=2)
-        
-        plt.xticks(x, periods_list, rotation=45)
-        plt.xlabel("Período", fontsize=12)
-        plt.ylabel("Issues acumuladas", fontsize=12)
-        plt.title("🔥 Burn-up Chart da Organização", fontsize=14, pad=20)
-        plt.legend(fontsize=10)
-        plt.grid(axis='y', linestyle='--', alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(filename)
-        plt.close()
-        
-        return filename, df
-        
+                        # Vertical line at prediction
+                        forecast_x = len(periods_list) - 1 + periods_to_finish
+                        forecast_label = f"Previsão: {predicted_date_str}"
+        
+        job = self.chart_job(render_burnup, "organization_burnup", {
+            'periods': periods_list,
+            'cumulative_promised': df["cumulative_promised"].tolist(),
+            'cumulative_delivered': df["cumulative_delivered"].tolist(),
+            'trend': trend_values,
+            'forecast_x': forecast_x,
+            'forecast_label': forecast_label,
+            'title': "🔥 Burn-up Chart da Organização",
+        })
+        return job, df
+
     def compute_weekly_delivery_stats(self) -> pd.DataFrame:
         """Compute biweekly stats for all issues across all repositories."""
-        df = self.issues_df.copy()
-        
-        # Convert created_at to datetime and get two-week period
-        df["created_at"] = pd.to_datetime(df["created_at"])
-        # Use 2W for two-week periods instead of W for weekly
-        df["period"] = df["created_at"].dt.to_period("2W").apply(lambda r: r.start_time)
-        
-        # Group by two-week period and state, calculate counts
-        grouped = df.groupby(["period", "state"]).size().unstack(fill_value=0)
-        
-        # Ensure we have open and closed columns
-        for col in ["open", "closed"]:
-            if col not in grouped.columns:
-                grouped[col] = 0
-        
-        # Calculate additional metrics
-        grouped["promised"] = grouped["open"] + grouped["closed"]
-        grouped["delivered"] = grouped["closed"]
-        grouped["percent_completed"] = (grouped["closed"] / grouped["promised"]).fillna(0) * 100
-        
-        # Reset index to make period a column
-        return grouped.reset_index()
+        grouped = None
+        if self.aggregation_backend == "sql":
+            try:
+                grouped = self.count_issues_by_period_sql()
+            except Exception as e:
+                print(f"⚠️ Agregação SQL indisponível, usando pandas: {str(e)}")
+        if grouped is None:
+            grouped = self.count_issues(["period"])
+        
+        # Calculate additional metrics, and reset index to make period a column
+        return delivery_columns(grouped).reset_index()
+
+    def compute_breakdowns(self) -> pd.DataFrame:
+        """Count issues per assignee, label and milestone, period and state in one pass.
+
+        Returns open/closed counts indexed by ``(dimension, value, period)``.
+        An issue counts once in each of its slices.
+        """
+        counts = pd.concat([partial['slices'] for partial in self.issue_partials()])
+        if counts.empty:
+            index = pd.MultiIndex.from_arrays([[], [], pd.DatetimeIndex([])], names=["dimension", "value", "period"])
+            return pd.DataFrame({"open": [], "closed": []}, index=index, dtype="int64")
+        grouped = counts.groupby(level=[0, 1, 2, 3]).sum().unstack(fill_value=0)
+        grouped.columns = grouped.columns.astype(str)
+        return state_columns(grouped)[["open", "closed"]].rename_axis(columns=None)
+
+    def breakdown_stats(self, breakdowns: pd.DataFrame) -> pd.DataFrame:
+        """Open/closed totals of each slice, largest first within each dimension."""
+        grouped = breakdowns.groupby(level=["dimension", "value"]).sum()
+        grouped["total"] = grouped["open"] + grouped["closed"]
+        grouped["percent_closed"] = (grouped["closed"] / grouped["total"] * 100).fillna(0).round(1)
+        grouped = grouped.reset_index()
+        grouped["order"] = grouped["dimension"].map({d: i for i, d in enumerate(DIMENSIONS)})
+        return grouped.sort_values(["order", "total", "value"], ascending=[True, False, True], ignore_index=True).drop(columns="order")
+
+    def breakdown_periods(self, breakdowns: pd.DataFrame, dimension: str, value: str) -> pd.DataFrame:
+        """Biweekly promised/delivered table of one slice, like ``compute_weekly_delivery_stats``."""
+        return delivery_columns(breakdowns.loc[(dimension, value)].copy()).reset_index()
+
+    def breakdown_jobs(self, breakdowns: pd.DataFrame, slice_stats: pd.DataFrame) -> List[ChartJob]:
+        """Prepare a biweekly chart for the top slices of each dimension."""
+        return [
+            self.weekly_delivery_job(
+                self.breakdown_periods(breakdowns, row.dimension, row.value),
+                f"breakdown_{row.dimension}_{slug(row.value)}",
+                f"📊 Entregas Quinzenais - {row.value}",
+            )
+            for row in slice_stats.itertuples(index=False)
+        ]
+
+    def generate_breakdown_section(self, slice_stats: pd.DataFrame, jobs: List[ChartJob]) -> str:
+        titles = {"assignee": "👤 Por Responsável", "label": "🏷️ Por Label", "milestone": "🎯 Por Milestone"}
+        charts = dict(zip(zip(slice_stats["dimension"], slice_stats["value"]), jobs))
+        parts = []
+        for dimension, rows in slice_stats.groupby("dimension", sort=False):
+            header = f"## {titles.get(dimension, dimension)}\n\n" + STATE_TABLE.format(title="Valor", rule="-------")
+            parts.append(markdown_table(header, rows, {"value": "%s", **STATE_COLUMNS}) + "\n")
+            parts.extend(
+                f"### {value}\n\n![{dimension} {value} biweekly chart]({charts[(dimension, value)].filename})\n\n"
+                for value in rows["value"]
+            )
+        return "".join(parts)
+
+    def top_slices(self, breakdowns: pd.DataFrame) -> pd.DataFrame:
+        """The ``breakdown_top`` largest slices of each dimension."""
+        return self.breakdown_stats(breakdowns).groupby("dimension", sort=False).head(self.breakdown_top)
+
+    def compute_flow_metrics(self) -> dict:
+        """Compute throughput by close date, lead time percentiles and daily WIP in one pass."""
+        partials = self.issue_partials()
+        lead = [partial['lead_times'] for partial in partials]
+        
+        # Per-day event counts are all the sweeps need, so batches only add up counts
+        opened = merge_counts([partial['opened'] for partial in partials])
+        closed = merge_counts([partial['closed'] for partial in partials])
+        wip = daily_wip(opened, closed)
+        return {
+            'throughput': throughput_by_period(closed),
+            'lead_time': summarize_lead_times(np.concatenate(lead) if lead else np.empty(0)),
+            'wip': wip,
+            'current_wip': int(wip["wip"].iloc[-1]) if len(wip) else 0,
+        }
+
+    def flow_metrics_job(self, flow: dict) -> ChartJob:
+        """Prepare the daily WIP chart."""
+        return self.chart_job(render_wip, "organization_wip", {
+            'days': flow['wip']["day"].dt.strftime("%Y-%m-%d").tolist(),
+            'wip': flow['wip']["wip"].tolist(),
+            'title': "⏱️ Trabalho em Andamento (WIP) da Organização",
+        })
+
+    def generate_flow_section(self, flow: dict, wip_filename: str) -> str:
+        lead = flow['lead_time']
+        
+        def days(value):
+            return "-" if value is None else f"{value:.1f} dias"
+        
+        rows = [
+            ("Lead Time Médio", days(lead['mean'])),
+            ("Lead Time P50", days(lead['p50'])),
+            ("Lead Time P85", days(lead['p85'])),
+            ("Lead Time P95", days(lead['p95'])),
+            ("WIP Atual", f"{flow['current_wip']} issues"),
+        ]
+        if len(flow['throughput']):
+            rows.append(("Vazão Média (por data de fechamento)", f"{flow['throughput']['throughput'].mean():.2f} issues/período"))
+        header = f"## ⏱️ Métricas de Fluxo\n\n![Organization WIP chart]({wip_filename})\n\n" + METRIC_TABLE
+        return key_value_table(header, rows) + "\n"
+
+    def count_issues_by_period_sql(self) -> pd.DataFrame:
+        """Count issues per period and state from the store's ``issue_periods`` aggregate."""
+        # The aggregate is maintained by every upsert, so this reads one row per
+        # repository, period and state instead of scanning the issues
+        store = self.load_cache()
+        sql = f"""
+            SELECT period, state, sum(row_count) AS issues
+            FROM {store.aggregate_source("issue_periods")}
+            WHERE len(?) = 0 OR list_contains(?, repository)
+            GROUP BY ALL
+        """
+        counts = store.query(sql, [self.repositories, self.repositories])
+        grouped = counts.pivot_table(index="period", columns="state", values="issues", aggfunc="sum", fill_value=0)
+        grouped.columns = grouped.columns.astype(str)
+        grouped.index = grouped.index.astype("datetime64[ns]")
+        return state_columns(grouped).astype("int64")
+
     def run_monte_carlo_simulation(self, weekly_data: pd.DataFrame) -> dict:
         """Run Monte Carlo simulation for organization completion date."""
-        # Sort data chronologically
-        df = weekly_data.sort_values("period")
-        
-        # Extract historical velocities
-        velocities = df["delivered"].tolist()
-        
-        # Calculate remaining work
-        df["cumulative_promised"] = df["promised"].cumsum()
-        df["cumulative_delivered"] = df["delivered"].cumsum()
-        remaining_work = df["cumulative_promised"].max() - df["cumulative_delivered"].max()
-        
-        # If no work left, return completed status
-        if remaining_work <= 0:
-            return {
-                'velocity_mean': np.mean(velocities),
-                'velocity_p10': np.percentile(velocities, 10) if len(velocities) > 0 else 0,
-                'velocity_p50': np.percentile(velocities, 50) if len(velocities) > 0 else 0,
-                'velocity_p90': np.percentile(velocities, 90) if len(velocities) > 0 else 0,
-                'completion_date_p10': "Complete",
-                'completion_date_p50': "Complete",
-                'completion_date_p90': "Complete",
-                'simulation_data': [],
-            }
-        
-        # Get last date as starting point
-        last_date = pd.to_datetime(df["period"].max())
-        
-        # Run simulations
-        simulation_data = []
-        print(f"🎲 Executando {self.monte_carlo_simulations} simulações Monte Carlo...")
-        
-        for _ in range(self.monte_carlo_simulations):
-            # Bootstrap sampling of historical velocities
-            sampled_velocities = random.choices(velocities, k=len(velocities))
-            
-            # Calculate mean velocity with random factor
-            mean_velocity = np.mean(sampled_velocities) * random.uniform(0.8, 1.2)
-            
-            # Skip if velocity is zero or negative
-            if mean_velocity <= 0:
-                continue
-            
-            # Calculate periods to completion
-            periods_to_completion = remaining_work / mean_velocity
-            
-            # Calculate completion date - now each period is 14 days (biweekly)
-            completion_date = last_date + pd.Timedelta(days=int(periods_to_completion * 14))
-            
-            # Store simulation results
-            simulation_data.append({
-                'velocity': mean_velocity,
-                'periods_to_completion': periods_to_completion,
-                'completion_date': completion_date
-            })
-        
-        # Calculate statistics from simulation results
-        if not simulation_data:
-            return {
-                'velocity_mean': np.mean(velocities) if velocities else 0,
-                'velocity_p10': 0, 
-                'velocity_p50': 0,
-                'velocity_p90': 0,
-                'completion_date_p10': None,
-                'completion_date_p50': None,
-                'completion_date_p90': None,
-                'simulation_data': [],
-            }
-        
-        # Extract velocities and completion dates
-        all_velocities = [sim['velocity'] for sim in simulation_data]
-        all_completion_dates = [sim['completion_date'] for sim in simulation_data]
-        
-        # Calculate percentiles
-        velocity_mean = np.mean(all_velocities)
-        velocity_p10 = np.percentile(all_velocities, 10)
-        velocity_p50 = np.percentile(all_velocities, 50)
-        velocity_p90 = np.percentile(all_velocities, 90)
-        
-        # Calculate date percentiles
-        completion_dates_sorted = sorted(all_completion_dates)
-        idx_p10 = min(int(0.1 * len(completion_dates_sorted)), len(completion_dates_sorted) - 1)
-        idx_p50 = min(int(0.5 * len(completion_dates_sorted)), len(completion_dates_sorted) - 1)
-        idx_p90 = min(int(0.9 * len(completion_dates_sorted)), len(completion_dates_sorted) - 1)
-        
-        completion_date_p10 = completion_dates_sorted[idx_p10]
-        completion_date_p50 = completion_dates_sorted[idx_p50]
-        completion_date_p90 = completion_dates_sorted[idx_p90]
-        
-        print("✅ Simulações Monte Carlo concluídas.")
-        
+        item = self.forecast_input(weekly_data)
+        if item.remaining_work > 0:
+            if self.monte_carlo_tolerance_days is None:
+                print(f"🎲 Executando {self.monte_carlo_simulations} simulações Monte Carlo...")
+            else:
+                print(f"🎲 Executando até {self.monte_carlo_simulations} simulações Monte Carlo "
+                      f"(lotes de {self.monte_carlo_batch_size}, tolerância de {self.monte_carlo_tolerance_days} dia(s))...")
+        results = forecast(*item, self.monte_carlo_simulations, self.monte_carlo_seed, **self.forecast_options())
+        if len(results['completion_dates']) > 0:
+            print(f"✅ Simulações Monte Carlo concluídas ({results['trials']} simulações).")
+        return results
+
+    def forecast_options(self) -> dict:
         return {
-            'velocity_mean': velocity_mean,
-            'velocity_p10': velocity_p10,
-            'velocity_p50': velocity_p50,
-            'velocity_p90': velocity_p90,
-            'completion_date_p10': completion_date_p10.strftime('%Y-%m-%d'),
-            'completion_date_p50': completion_date_p50.strftime('%Y-%m-%d'),
-            'completion_date_p90': completion_date_p90.strftime('%Y-%m-%d'),
-            'simulation_data': simulation_data,
+            'tolerance_days': self.monte_carlo_tolerance_days,
+            'batch_size': self.monte_carlo_batch_size,
+            'window': self.velocity_window,
+            'half_life': self.velocity_half_life,
         }
 
-    def plot_monte_carlo_simulations(self, mc_results: dict):
-        """Create Monte Carlo visualizations for the organization."""
-        if not mc_results['simulation_data']:
-            return None, None
-        
-        # Completion date histogram
-        mc_filename = f"{self.output_dir}/organization_monte_carlo.png"
-        plt.figure(figsize=(12, 6))
+    def forecast_input(self, weekly_data: pd.DataFrame) -> ForecastInput:
+        """Historical velocities, remaining work and last period of a biweekly table."""
+        # Sort data chronologically
+        df = weekly_data.sort_values("period")
+        return ForecastInput(
+            velocities=df["delivered"].to_numpy(dtype=np.float64),
+            remaining_work=df["promised"].sum() - df["delivered"].sum(),
+            last_date=np.datetime64(df["period"].iloc[-1], "D") if len(df) else None,
+        )
+
+    def team_period_counts(self, breakdowns: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Open/closed issues per ``(team, period)``, teams being the ``forecast_by`` slices."""
+        if self.forecast_by == "repository":
+            return self.count_issues(["repository", "period"])
+        if breakdowns is None:
+            breakdowns = self.compute_breakdowns()
+        if self.forecast_by not in breakdowns.index.get_level_values("dimension"):
+            # No issue has a value in this dimension, e.g. a repository without milestones
+            index = pd.MultiIndex.from_arrays([[], pd.DatetimeIndex([])], names=["value", "period"])
+            return pd.DataFrame({"open": [], "closed": []}, index=index, dtype="int64")
+        return breakdowns.xs(self.forecast_by, level="dimension")
+
+    def run_team_forecasts(self, team_counts: pd.DataFrame) -> pd.DataFrame:
+        """Forecast every team in parallel, reproducibly for a given ``monte_carlo_seed``."""
+        teams, items = [], []
+        for team, counts in team_counts.groupby(level=0, observed=True, sort=True):
+            weekly = delivery_columns(counts.droplevel(0).rename_axis("period").reset_index())
+            teams.append(str(team))
+            items.append(self.forecast_input(weekly))
+        print(f"🎲 Executando previsões Monte Carlo para {len(teams)} equipe(s) por {self.forecast_by}...")
+        results = forecast_many(items, self.monte_carlo_simulations, self.monte_carlo_seed, self.forecast_workers,
+                                **self.forecast_options())
+        forecasts = pd.DataFrame(results, index=pd.Index(teams, name="team")).reset_index()
+        forecasts.insert(1, "remaining_work", [item.remaining_work for item in items])
+        return forecasts
+
+    def generate_team_forecast_section(self, forecasts: pd.DataFrame) -> str:
+        titles = {"repository": "Repositório", "assignee": "Responsável", "label": "Label", "milestone": "Milestone"}
+        header = TEAM_FORECAST_TABLE.format(title=titles.get(self.forecast_by, self.forecast_by))
+        
+        def completion(dates: pd.Series) -> pd.Series:
+            return dates.replace("Complete", "Já concluído").fillna("-")
+        
+        return markdown_table(header, forecasts, {
+            "team": "%s",
+            "remaining_work": "%d",
+            "velocity_p50": "%.2f",
+            "completion_date_p10": completion,
+            "completion_date_p50": completion,
+            "completion_date_p90": completion,
+            "trials": "%d",
+        }) + "\n"
+
+    def monte_carlo_jobs(self, mc_results: dict) -> List[ChartJob]:
+        """Prepare the Monte Carlo completion date and velocity charts."""
+        if len(mc_results['completion_dates']) == 0:
+            return []
         
         # Extract completion dates
-        completion_dates = [sim['completion_date'] for sim in mc_results['simulation_data']]
+        dates = mc_results['completion_dates']
         
         # Calculate bins
-        min_date = min(completion_dates)
-        max_date = max(completion_dates)
-        weeks_span = (max_date - min_date).days // 7 + 1
+        min_date = dates.min()
+        max_date = dates.max()
+        weeks_span = int((max_date - min_date).astype(np.int64)) // 7 + 1
         bins = min(weeks_span, 20)
         
-        # Convert dates to numerical format
-        completion_dates_num = [(date - min_date).days / 7 for date in completion_dates]
-        
-        # Plot histogram
-        plt.hist(completion_dates_num, bins=bins, alpha=0.7, color='blue', edgecolor='black', linewidth=0.5)
-        
-        # Add percentile lines
-        p10_idx = int(len(completion_dates) * 0.1)
-        p50_idx = int(len(completion_dates) * 0.5)
-        p90_idx = int(len(completion_dates) * 0.9)
-        
-        sorted_dates_num = sorted(completion_dates_num)
-        p10_value = sorted_dates_num[p10_idx] if p10_idx < len(sorted_dates_num) else sorted_dates_num[-1]
-        p50_value = sorted_dates_num[p50_idx] if p50_idx < len(sorted_dates_num) else sorted_dates_num[-1]
-        p90_value = sorted_dates_num[p90_idx] if p90_idx < len(sorted_dates_num) else sorted_dates_num[-1]
-        
-        plt.axvline(x=p10_value, color='green', linestyle='--', linewidth=2, label='P10 (Otimista)')
-        plt.axvline(x=p50_value, color='orange', linestyle='--', linewidth=2, label='P50 (Provável)')
-        plt.axvline(x=p90_value, color='red', linestyle='--', linewidth=2, label='P90 (Conservador)')
+        # Convert dates to numerical format and bin them once here
+        completion_dates_num = (dates - min_date).astype(np.int64) / 7
+        date_counts, date_edges = np.histogram(completion_dates_num, bins=bins)
         
         # Set x-axis ticks to show dates
-        tick_positions = np.linspace(0, max(completion_dates_num), min(10, bins))
-        tick_labels = [(min_date + pd.Timedelta(days=int(pos * 7))).strftime('%Y-%m-%d') for pos in tick_positions]
-        plt.xticks(tick_positions, tick_labels, rotation=45)
-        
-        plt.title("🎲 Simulação Monte Carlo - Previsão de Conclusão", fontsize=14, pad=20)
-        plt.xlabel("Data de Conclusão Prevista", fontsize=12)
-        plt.ylabel("Número de Simulações", fontsize=12)
-        plt.grid(axis='y', linestyle='--', alpha=0.3)
-        plt.legend(fontsize=10)
-        plt.tight_layout()
-        plt.savefig(mc_filename)
-        plt.close()
+        tick_positions = np.linspace(0, completion_dates_num.max(), min(10, bins))
+        tick_labels = [str(min_date + np.timedelta64(int(pos * 7), 'D')) for pos in tick_positions]
+        
+        mc_job = self.chart_job(render_histogram, "organization_monte_carlo", {
+            'counts': date_counts,
+            'edges': date_edges,
+            'percentiles': [
+                (order_statistic(completion_dates_num, 0.1), 'green', 'P10 (Otimista)'),
+                (order_statistic(completion_dates_num, 0.5), 'orange', 'P50 (Provável)'),
+                (order_statistic(completion_dates_num, 0.9), 'red', 'P90 (Conservador)'),
+            ],
+            'color': 'blue',
+            'xlabel': "Data de Conclusão Prevista",
+            'ylabel': "Número de Simulações",
+            'title': "🎲 Simulação Monte Carlo - Previsão de Conclusão",
+            'figsize': (12, 6),
+            'tick_positions': tick_positions,
+            'tick_labels': tick_labels,
+        })
         
         # Velocity distribution chart
-        vel_filename = f"{self.output_dir}/organization_velocity_dist.png"
-        plt.figure(figsize=(12, 5))
-        
-        velocities = [sim['velocity'] for sim in mc_results['simulation_data']]
-        plt.hist(velocities, bins=min(20, len(velocities)//5 + 1), alpha=0.7, color='green', 
-                edgecolor='black', linewidth=0.5)
-        
-        plt.axvline(x=mc_results['velocity_p10'], color='green', linestyle='--', linewidth=2, label='P10')
-        plt.axvline(x=mc_results['velocity_p50'], color='orange', linestyle='--', linewidth=2, label='P50')
-        plt.axvline(x=mc_results['velocity_p90'], color='red', linestyle='--', linewidth=2, label='P90')
-        
-        plt.title("📊 Distribuição de Velocidade da Organização", fontsize=14, pad=20)
-        plt.xlabel("Velocidade (issues/semana)", fontsize=12)
-        plt.ylabel("Frequência", fontsize=12)
-        plt.grid(axis='y', linestyle='--', alpha=0.3)
-        plt.legend(fontsize=10)
-        plt.tight_layout()
-        plt.savefig(vel_filename)
-        plt.close()
-        
-        return mc_filename, vel_filename
+        velocities = mc_results['simulated_velocities']
+        velocity_counts, velocity_edges = np.histogram(velocities, bins=min(20, len(velocities)//5 + 1))
+        vel_job = self.chart_job(render_histogram, "organization_velocity_dist", {
+            'counts': velocity_counts,
+            'edges': velocity_edges,
+            'percentiles': [
+                (mc_results['velocity_p10'], 'green', 'P10'),
+                (mc_results['velocity_p50'], 'orange', 'P50'),
+                (mc_results['velocity_p90'], 'red', 'P90'),
+            ],
+            'color': 'green',
+            'xlabel': "Velocidade (issues/semana)",
+            'ylabel': "Frequência",
+            'title': "📊 Distribuição de Velocidade da Organização",
+        })
+        
+        return [mc_job, vel_job]
+
+    def describe_convergence(self, mc_results: dict) -> str:
+        """Explain why the adaptive mode stopped after ``trials`` simulations."""
+        tolerance = self.monte_carlo_tolerance_days
+        if mc_results['converged']:
+            return (f"As simulações rodaram em lotes de {self.monte_carlo_batch_size} e pararam após {mc_results['trials']}, "
+                    f"quando P10/P50/P90 variaram no máximo {tolerance} dia(s) entre lotes.")
+        return (f"As simulações rodaram em lotes de {self.monte_carlo_batch_size} até o limite de {mc_results['trials']} "
+                f"sem que P10/P50/P90 estabilizassem dentro de {tolerance} dia(s); as datas podem variar entre execuções.")
+
+    def describe_sampling(self) -> str:
+        parts = []
+        if self.velocity_window:
+            parts.append(f"Apenas os últimos {self.velocity_window} períodos entram na amostragem.")
+        if self.velocity_half_life:
+            parts.append(f"Períodos recentes pesam mais: o peso cai pela metade a cada {self.velocity_half_life} períodos para trás.")
+        return " ".join(parts)
 
     def create_monte_carlo_explanation(self, mc_results: dict) -> str:
         """Create explanation for Monte Carlo simulation results."""
-        markdown = "### Explicação da Simulação Monte Carlo\n\n"
-        markdown += "| Conceito | Explicação |\n"
-        markdown += "|---------|------------|\n"
-        markdown += "| **O que é Monte Carlo?** | Técnica estatística que utiliza amostragens aleatórias repetidas para obter resultados numéricos e estimar probabilidades. |\n"
-        markdown += "| **Como funciona a simulação?** | 1) Coletamos o histórico de velocidade da organização (issues concluídas/semana)<br>2) Fazemos 1000 simulações com variações aleatórias dessas velocidades<br>3) Para cada simulação, calculamos quando o trabalho restante seria concluído<br>4) Organizamos os resultados e calculamos os percentis |\n"
-        markdown += "| **O que significa P10?** | Cenário otimista. Existe apenas 10% de chance de concluir o trabalho antes desta data. É um resultado rápido e favorável, mas menos provável. |\n"
-        markdown += "| **O que significa P50?** | Cenário mais provável. 50% de chance de terminar antes ou depois desta data. É nossa melhor estimativa 'realista'. |\n"
-        markdown += "| **O que significa P90?** | Cenário conservador. Existe 90% de chance de concluir antes desta data. Útil para planejamento seguro, pois é improvável atrasar além deste ponto. |\n"
-        markdown += "| **Por que usar Monte Carlo?** | Fornece intervalos de confiança em vez de datas únicas, reconhecendo a incerteza natural no desenvolvimento. Captura a variabilidade histórica da organização. |\n"
-        markdown += "| **Como interpretar velocidades?** | Quanto maior a velocidade, mais rápido a organização conclui issues. P10/P50/P90 para velocidades mostram diferentes cenários de produtividade que usamos nos cálculos. |\n"
+        parts = [MONTE_CARLO_EXPLANATION.format(trials=mc_results['trials'])]
+        if self.velocity_window or self.velocity_half_life:
+            parts.append(f"| **Quais períodos são amostrados?** | {self.describe_sampling()} |\n")
+        if mc_results['converged'] is not None:
+            parts.append(f"| **Quantas simulações?** | {self.describe_convergence(mc_results)} |\n")
         
         # Add data context if we have simulation data
-        if mc_results['simulation_data'] and len(mc_results['simulation_data']) > 0:
+        if len(mc_results['simulated_velocities']) > 0:
             historical_context = "| **Contexto dos dados** | "
             
             if mc_results['completion_date_p10'] != "Complete" and mc_results['completion_date_p10'] is not None:
-                # Extract velocity info for volatility calculation
-                historical_velocities = []
-                for sim in mc_results['simulation_data']:
-                    if 'velocity' in sim:
-                        historical_velocities.append(sim['velocity'])
-                
-                # Calculate and interpret volatility
-                if historical_velocities:
-                    mean_velocity = np.mean(historical_velocities)
-                    std_velocity = np.std(historical_velocities)
+                # Calculate and interpret volatility of the simulated velocities
+                historical_velocities = mc_results['simulated_velocities']
+                if len(historical_velocities) > 0:
+                    mean_velocity = historical_velocities.mean()
+                    std_velocity = historical_velocities.std()
                     volatility = (std_velocity / mean_velocity) * 100 if mean_velocity > 0 else 0
                     
                     if volatility < 20:
@@ -389,201 +657,275 @@ class OrganizationalDashboard (AbstractDasboard):
                             historical_context += f"Devido à alta variabilidade, considere usar P70-P80 para comunicação de prazos ao invés de P50."
             
             historical_context += " |"
-            markdown += historical_context + "\n"
+            parts.append(historical_context + "\n")
         
-        return markdown
+        return "".join(parts)
 
-    def generate_markdown_report(self, stats: dict, weekly_data: pd.DataFrame, mc_results: dict) -> str:
-        """Generate complete markdown report for the organization."""
+    def write_markdown_report(self, report: MarkdownReport, stats: dict, weekly_data: pd.DataFrame, mc_results: dict,
+                              repo_stats: pd.DataFrame = None, flow: dict = None,
+                              breakdowns: pd.DataFrame = None, team_forecasts: pd.DataFrame = None):
+        """Write the complete markdown report for the organization to ``report``."""
         # Start with the header and summary stats
-        markdown = self.generate_markdown_header(stats)
-        markdown += "\n---\n"
-        
-        # Add biweekly delivery section
-        weekly_file = self.plot_weekly_delivery(weekly_data)
-        markdown += "## 📊 Entregas Quinzenais da Organização\n\n"
-        markdown += f"![Organization biweekly chart]({weekly_file})\n\n"
-        
-        # Add velocity stats
+        report.write(self.generate_markdown_header(stats))
+        
+        # Add per-repository breakdown when reporting on several repositories
+        if repo_stats is not None and len(repo_stats) > 1:
+            report.write(self.generate_repository_section(repo_stats))
+        report.write("\n---\n")
+        
+        # Prepare every chart up front and render them in parallel
+        has_simulation = bool(mc_results) and len(mc_results['completion_dates']) > 0
+        weekly_job = self.weekly_delivery_job(weekly_data)
+        burnup_job, _ = self.burnup_chart_job(weekly_data)
+        mc_jobs = self.monte_carlo_jobs(mc_results) if has_simulation else []
+        flow_jobs = [self.flow_metrics_job(flow)] if flow is not None else []
+        slice_stats = self.top_slices(breakdowns) if breakdowns is not None else None
+        breakdown_jobs = self.breakdown_jobs(breakdowns, slice_stats) if breakdowns is not None else []
+        with self.instrumentation.stage("render_charts") as stage:
+            jobs = [weekly_job, burnup_job] + flow_jobs + mc_jobs + breakdown_jobs
+            render_charts(jobs, self.render_workers, self.chart_cache)
+            stage.rows = len(jobs)
+        
+        # Add biweekly delivery section with the velocity stats
         avg_velocity = weekly_data["delivered"].mean().round(2)
-        markdown += f"**Velocidade média quinzenal:** {avg_velocity} issues/quinzena\n\n"
-        
-        # Add biweekly data table
-        markdown += "| Período | Prometido | Entregue | % Concluído | Velocidade |\n"
-        markdown += "|--------|------------|----------|--------------|------------|\n"
-        
-        for _, row in weekly_data.sort_values("period").iterrows():
-            period = row['period'].strftime('%Y-%m-%d')
-            markdown += f"| {period} | {int(row['promised'])} | {int(row['delivered'])} | {round(row['percent_completed'], 1)}% | {int(row['delivered'])} |\n"
-        
-        markdown += "\n"
+        report.write(
+            "## 📊 Entregas Quinzenais da Organização\n\n",
+            f"![Organization biweekly chart]({weekly_job.filename})\n\n",
+            f"**Velocidade média quinzenal:** {avg_velocity} issues/quinzena\n\n",
+        )
+        
+        # Add biweekly data table, formatted a column at a time
+        weekly = weekly_data.sort_values("period")
+        report.table(WEEKLY_TABLE, weekly.assign(velocity=weekly["delivered"]), {
+            "period": lambda period: period.dt.strftime("%Y-%m-%d"),
+            "promised": "%d",
+            "delivered": "%d",
+            "percent_completed": "%.1f%%",
+            "velocity": "%d",
+        })
+        report.write("\n")
         
         # Add burnup chart section
-        burnup_file, _ = self.plot_burnup_chart(weekly_data)
-        markdown += "## 🔥 Burn-up Chart da Organização\n\n"
-        markdown += f"![Organization burnup chart]({burnup_file})\n\n"
+        report.write(
+            "## 🔥 Burn-up Chart da Organização\n\n",
+            f"![Organization burnup chart]({burnup_job.filename})\n\n",
+        )
+        
+        # Add flow metrics section
+        if flow is not None:
+            report.write(self.generate_flow_section(flow, flow_jobs[0].filename))
         
         # Add Monte Carlo section if we have simulation data
-        if mc_results and mc_results['simulation_data']:
-            mc_file, vel_file = self.plot_monte_carlo_simulations(mc_results)
+        if has_simulation:
+            mc_file, vel_file = [job.filename for job in mc_jobs]
             
-            markdown += "## 🎲 Simulação Monte Carlo\n\n"
-            markdown += f"![Organization monte carlo simulation]({mc_file})\n\n"
-            markdown += f"![Organization velocity distribution]({vel_file})\n\n"
+            report.write(
+                "## 🎲 Simulação Monte Carlo\n\n",
+                f"![Organization monte carlo simulation]({mc_file})\n\n",
+                f"![Organization velocity distribution]({vel_file})\n\n",
+            )
             
             # Add results table
-            markdown += "### Previsões de Velocidade e Conclusão da Organização\n\n"
-            markdown += "| Métrica | Valor |\n"
-            markdown += "|--------|-------|\n"
-            
-            markdown += f"| Velocidade Média | {mc_results['velocity_mean']:.2f} issues/quinzena |\n"
-            markdown += f"| Velocidade P10 (Otimista) | {mc_results['velocity_p10']:.2f} issues/quinzena |\n"
-            markdown += f"| Velocidade P50 (Provável) | {mc_results['velocity_p50']:.2f} issues/quinzena |\n"
-            markdown += f"| Velocidade P90 (Conservador) | {mc_results['velocity_p90']:.2f} issues/quinzena |\n"
-            
+            convergence = {True: " (convergiu)", False: " (limite atingido)"}.get(mc_results['converged'], "")
+            rows = [
+                ("Velocidade Média", f"{mc_results['velocity_mean']:.2f} issues/quinzena"),
+                ("Velocidade P10 (Otimista)", f"{mc_results['velocity_p10']:.2f} issues/quinzena"),
+                ("Velocidade P50 (Provável)", f"{mc_results['velocity_p50']:.2f} issues/quinzena"),
+                ("Velocidade P90 (Conservador)", f"{mc_results['velocity_p90']:.2f} issues/quinzena"),
+                ("Simulações", f"{mc_results['trials']}{convergence}"),
+            ]
             if mc_results['completion_date_p10'] == "Complete":
-                markdown += f"| Conclusão | Já concluído |\n"
+                rows.append(("Conclusão", "Já concluído"))
             elif mc_results['completion_date_p10'] is None:
-                markdown += f"| Conclusão | Dados insuficientes para previsão |\n"
+                rows.append(("Conclusão", "Dados insuficientes para previsão"))
             else:
-                markdown += f"| Data de Conclusão P10 (Otimista) | {mc_results['completion_date_p10']} |\n"
-                markdown += f"| Data de Conclusão P50 (Provável) | {mc_results['completion_date_p50']} |\n"
-                markdown += f"| Data de Conclusão P90 (Conservador) | {mc_results['completion_date_p90']} |\n"
+                rows += [
+                    ("Data de Conclusão P10 (Otimista)", mc_results['completion_date_p10']),
+                    ("Data de Conclusão P50 (Provável)", mc_results['completion_date_p50']),
+                    ("Data de Conclusão P90 (Conservador)", mc_results['completion_date_p90']),
+                ]
+            header = "### Previsões de Velocidade e Conclusão da Organização\n\n" + METRIC_TABLE
+            report.write(key_value_table(header, rows), "\n")
             
-            markdown += "\n"
+            # Add per-team forecasts
+            if team_forecasts is not None and len(team_forecasts) > 1:
+                report.write(self.generate_team_forecast_section(team_forecasts))
             
             # Add Monte Carlo explanation
-            markdown += self.create_monte_carlo_explanation(mc_results)
-        
-        return markdown
-    def run_monte_carlo_simulation(self, weekly_data: pd.DataFrame) -> dict:
-        """Run Monte Carlo simulation for organization completion date."""
-        # Sort data chronologically
-        df = weekly_data.sort_values("period")
-        
-        # Extract historical velocities
-        velocities = df["delivered"].tolist()
-        
-        # Calculate remaining work
-        df["cumulative_promised"] = df["promised"].cumsum()
-        df["cumulative_delivered"] = df["delivered"].cumsum()
-        remaining_work = df["cumulative_promised"].max() - df["cumulative_delivered"].max()
-        
-        # If no work left, return completed status
-        if remaining_work <= 0:
-            return {
-                'velocity_mean': np.mean(velocities),
-                'velocity_p10': np.percentile(velocities, 10) if len(velocities) > 0 else 0,
-                'velocity_p50': np.percentile(velocities, 50) if len(velocities) > 0 else 0,
-                'velocity_p90': np.percentile(velocities, 90) if len(velocities) > 0 else 0,
-                'completion_date_p10': "Complete",
-                'completion_date_p50': "Complete",
-                'completion_date_p90': "Complete",
-                'simulation_data': [],
-            }
-        
-        # Get last date as starting point
-        last_date = pd.to_datetime(df["period"].max())
-        
-        # Run simulations
-        simulation_data = []
-        print(f"🎲 Executando {self.monte_carlo_simulations} simulações Monte Carlo...")
-        
-        for _ in range(self.monte_carlo_simulations):
-            # Bootstrap sampling of historical velocities
-            sampled_velocities = random.choices(velocities, k=len(velocities))
-            
-            # Calculate mean velocity with random factor
-            mean_velocity = np.mean(sampled_velocities) * random.uniform(0.8, 1.2)
-            
-            # Skip if velocity is zero or negative
-            if mean_velocity <= 0:
-                continue
-            
-            # Calculate periods to completion
-            periods_to_completion = remaining_work / mean_velocity
-            
-            # Calculate completion date - now each period is 14 days (biweekly)
-            completion_date = last_date + pd.Timedelta(days=int(periods_to_completion * 14))
-            
-            # Store simulation results
-            simulation_data.append({
-                'velocity': mean_velocity,
-                'periods_to_completion': periods_to_completion,
-                'completion_date': completion_date
-            })
-        
-        # Calculate statistics from simulation results
-        if not simulation_data:
-            return {
-                'velocity_mean': np.mean(velocities) if velocities else 0,
-                'velocity_p10': 0, 
-                'velocity_p50': 0,
-                'velocity_p90': 0,
-                'completion_date_p10': None,
-                'completion_date_p50': None,
-                'completion_date_p90': None,
-                'simulation_data': [],
-            }
-        
-        # Extract velocities and completion dates
-        all_velocities = [sim['velocity'] for sim in simulation_data]
-        all_completion_dates = [sim['completion_date'] for sim in simulation_data]
-        
-        # Calculate percentiles
-        velocity_mean = np.mean(all_velocities)
-        velocity_p10 = np.percentile(all_velocities, 10)
-        velocity_p50 = np.percentile(all_velocities, 50)
-        velocity_p90 = np.percentile(all_velocities, 90)
-        
-        # Calculate date percentiles
-        completion_dates_sorted = sorted(all_completion_dates)
-        idx_p10 = min(int(0.1 * len(completion_dates_sorted)), len(completion_dates_sorted) - 1)
-        idx_p50 = min(int(0.5 * len(completion_dates_sorted)), len(completion_dates_sorted) - 1)
-        idx_p90 = min(int(0.9 * len(completion_dates_sorted)), len(completion_dates_sorted) - 1)
-        
-        completion_date_p10 = completion_dates_sorted[idx_p10]
-        completion_date_p50 = completion_dates_sorted[idx_p50]
-        completion_date_p90 = completion_dates_sorted[idx_p90]
-        
-        print("✅ Simulações Monte Carlo concluídas.")
+            report.write(self.create_monte_carlo_explanation(mc_results))
         
+        # Add assignee, label and milestone breakdowns
+        if breakdown_jobs:
+            report.write("\n---\n", self.generate_breakdown_section(slice_stats, breakdown_jobs))
+
+    def generate_markdown_report(self, stats: dict, weekly_data: pd.DataFrame, mc_results: dict,
+                                 repo_stats: pd.DataFrame = None, flow: dict = None,
+                                 breakdowns: pd.DataFrame = None, team_forecasts: pd.DataFrame = None) -> str:
+        """Generate complete markdown report for the organization."""
+        report = MarkdownReport()
+        self.write_markdown_report(report, stats, weekly_data, mc_results, repo_stats, flow, breakdowns, team_forecasts)
+        return report.getvalue()
+
+    def summarize(self, results: dict) -> dict:
+        """JSON-ready summary of ``analyze()`` results: stats, forecasts, flow metrics and breakdowns."""
+        mc_results = results['mc_results']
         return {
-            'velocity_mean': velocity_mean,
-            'velocity_p10': velocity_p10,
-            'velocity_p50': velocity_p50,
-            'velocity_p90': velocity_p90,
-            'completion_date_p10': completion_date_p10.strftime('%Y-%m-%d'),
-            'completion_date_p50': completion_date_p50.strftime('%Y-%m-%d'),
-            'completion_date_p90': completion_date_p90.strftime('%Y-%m-%d'),
-            'simulation_data': simulation_data,
+            'stats': results['stats'],
+            'periods': len(results['weekly_data']),
+            'forecast': {k: v for k, v in mc_results.items() if k.startswith(('velocity_', 'completion_date_')) or k in ('trials', 'converged')},
+            'lead_time_days': results['flow']['lead_time'],
+            'current_wip': results['flow']['current_wip'],
+            'breakdowns': self.top_slices(results['breakdowns']).to_dict("records"),
+            'team_forecasts': None if results['team_forecasts'] is None else results['team_forecasts'].to_dict("records"),
         }
 
+    def summary_json(self, results: dict) -> str:
+        return json.dumps(self.summarize(results), indent=2, default=lambda v: v.item() if hasattr(v, "item") else str(v))
 
-    def save_markdown(self, markdown: str, filename: str = "organization_stats.md"):
-        """Save markdown report to file."""
-        with open(filename, "w") as f:
-            f.write(markdown)
-        print(f"✅ Markdown salvo em {filename}")
+    def export_tables(self, results: dict) -> dict:
+        """The tables of ``analyze()`` results, flat enough for any export format."""
+        summary = self.summarize(results)
+        scalars = {k: summary[k] for k in ('stats', 'periods', 'forecast', 'lead_time_days', 'current_wip')}
+        tables = {
+            'summary': pd.json_normalize(scalars, sep="_"),
+            'repositories': results['repo_stats'],
+            'periods': results['weekly_data'],
+            'throughput': results['flow']['throughput'],
+            'wip': results['flow']['wip'],
+            'breakdowns': results['breakdowns'].reset_index(),
+        }
+        if results['team_forecasts'] is not None:
+            tables['team_forecasts'] = results['team_forecasts']
+        return tables
 
+    def export(self, results: dict):
+        """Write the result tables in every format of ``export_formats``."""
+        files = export_tables(self.export_tables(results), self.export_dir, self.export_formats)
+        print(f"✅ {len(files)} arquivo(s) exportado(s) em {self.export_dir}")
 
-    def run(self):
+    def history_forecasts(self, weekly_data: pd.DataFrame, mc_results: dict,
+                          team_forecasts: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Organization and team forecasts of a run, with dates as datetimes (NaT when complete or unknown)."""
+        columns = ["velocity_p50", "completion_date_p10", "completion_date_p50", "completion_date_p90", "trials"]
+        organization = {'team': ORGANIZATION, 'dimension': "organization",
+                        'remaining_work': self.forecast_input(weekly_data).remaining_work}
+        frames = [pd.DataFrame([{**organization, **{k: mc_results[k] for k in columns}}])]
+        if team_forecasts is not None:
+            frames.append(team_forecasts[["team", "remaining_work"] + columns].assign(dimension=self.forecast_by))
+        forecasts = pd.concat(frames, ignore_index=True)
+        for column in ["completion_date_p10", "completion_date_p50", "completion_date_p90"]:
+            forecasts[column] = pd.to_datetime(forecasts[column], format="%Y-%m-%d", errors="coerce")
+        return forecasts.astype({"remaining_work": "int64", "velocity_p50": "float64", "trials": "int64"})
+
+    def save_history(self, results: dict):
+        """Append this run's stats, biweekly counts and forecasts to ``history_dir``."""
+        runs = pd.DataFrame([{**results['stats'], 'periods': len(results['weekly_data']),
+                              'repositories': len(self.repositories)}])
+        periods = results['weekly_data'][["period", "promised", "delivered"]]
+        forecasts = self.history_forecasts(results['weekly_data'], results['mc_results'], results['team_forecasts'])
+        HistoryStore(directory=self.history_dir).record(runs, periods, forecasts)
+        print(f"✅ Histórico atualizado em {self.history_dir}")
+
+    def load_closures(self) -> pd.DataFrame:
+        """Close date of every closed issue, per repository and for the whole organization."""
+        sql = """
+            SELECT repository AS team, CAST(CAST(closed_at AS TIMESTAMP) AS DATE) AS closed
+            FROM issues
+            WHERE closed_at IS NOT NULL AND (len(?) = 0 OR list_contains(?, repository))
+        """
+        closures = self.load_cache().query(sql, [self.repositories, self.repositories])
+        return pd.concat([closures, closures.assign(team=ORGANIZATION)], ignore_index=True)
+
+    def backtest_history(self) -> pd.DataFrame:
+        """Replay every recorded organization and repository forecast against the issues closed since."""
+        history = HistoryStore(directory=self.history_dir)
+        if "forecasts" not in history.tables():
+            raise RuntimeError(f"Nenhum histórico de previsões em {self.history_dir}")
+        forecasts = history.query("""
+            SELECT team, run_at, remaining_work, completion_date_p10, completion_date_p50, completion_date_p90
+            FROM forecasts WHERE dimension IN ('organization', 'repository')
+        """)
+        print(f"⏪ Reavaliando {len(forecasts)} previsões do histórico...")
+        return backtest_summary(backtest(forecasts, self.load_closures()))
+
+    def analyze(self) -> dict:
+        """Compute every metric of the report without drawing anything."""
+        stage = self.instrumentation.stage
+        
+        # Count every batch once; when fetching, this already happened as each repository finished
+        with stage("partials") as metrics:
+            metrics.rows = len(self.issue_partials())
+        
         # Compute overall stats
-        stats = self.compute_stats()
+        with stage("compute_stats") as metrics:
+            stats = self.compute_stats()
+            metrics.rows = stats['total']
         print(f"📊 Estatísticas calculadas: {stats['total']} issues totais, {stats['percent_closed']}% concluídas.")
         
+        # Compute per-repository stats
+        with stage("repository_stats") as metrics:
+            repo_stats = self.compute_repository_stats()
+            metrics.rows = len(repo_stats)
+        
         # Compute weekly stats
-        weekly_data = self.compute_weekly_delivery_stats()
+        with stage("weekly_stats") as metrics:
+            weekly_data = self.compute_weekly_delivery_stats()
+            metrics.rows = len(weekly_data)
         print(f"📅 Dados semanais processados para {len(weekly_data)} semanas.")
         
-        # Run Monte Carlo simulation
-        mc_results = self.run_monte_carlo_simulation(weekly_data)
+        # Compute throughput, lead time and WIP
+        with stage("flow_metrics") as metrics:
+            flow = self.compute_flow_metrics()
+            metrics.rows = len(flow['wip'])
         
-        # Generate markdown report
-        markdown = self.generate_markdown_report(stats, weekly_data, mc_results)
+        # Break the counts down by assignee, label and milestone
+        with stage("breakdowns") as metrics:
+            breakdowns = self.compute_breakdowns()
+            metrics.rows = len(breakdowns)
         
-        # Save results
-        self.save_markdown(markdown)
-
+        # Run Monte Carlo simulation
+        with stage("monte_carlo") as metrics:
+            mc_results = self.run_monte_carlo_simulation(weekly_data)
+            metrics.rows = len(mc_results['completion_dates'])
+        
+        # Forecast each team in parallel
+        team_forecasts = None
+        if self.forecast_by:
+            with stage("team_forecasts") as metrics:
+                team_counts = self.team_period_counts(breakdowns)
+                if len(team_counts):
+                    team_forecasts = self.run_team_forecasts(team_counts)
+                    metrics.rows = len(team_forecasts)
+                else:
+                    print(f"⚠️ Nenhuma issue com {self.forecast_by}; previsões por equipe ignoradas.")
         
-        
\ No newline at end of file
+        return {
+            'stats': stats,
+            'repo_stats': repo_stats,
+            'weekly_data': weekly_data,
+            'mc_results': mc_results,
+            'flow': flow,
+            'breakdowns': breakdowns,
+            'team_forecasts': team_forecasts,
+        }
+
+    def run(self):
+        results = self.analyze()
+        
+        # Stream the markdown report to disk (includes the render_charts stage)
+        filename = "organization_stats.md"
+        with self.instrumentation.stage("report") as metrics:
+            with MarkdownReport.open(filename) as report:
+                self.write_markdown_report(
+                    report, results['stats'], results['weekly_data'], results['mc_results'], results['repo_stats'],
+                    results['flow'], results['breakdowns'], results['team_forecasts'],
+                )
+            print(f"✅ Markdown salvo em {filename}")
+            metrics.rows = report.lines
+        
+        if self.history_dir:
+            self.save_history(results)
+        if self.export_formats:
+            with self.instrumentation.stage("export"):
+                self.export(results)
+        self.save_metrics()
@@ -0,0 +1,41 @@
+from typing import Callable, Dict, List
+import os
+import pandas as pd
+
+
+def export_json(frame: pd.DataFrame, filename: str):
+    frame.to_json(filename, orient="records", indent=2, date_format="iso", force_ascii=False)
+
+
+def export_csv(frame: pd.DataFrame, filename: str):
+    frame.to_csv(filename, index=False)
+
+
+def export_parquet(frame: pd.DataFrame, filename: str):
+    # Mixed columns (dates or "Complete") are stored as text
+    mixed = [column for column in frame.columns
+             if frame[column].dtype == object and frame[column].map(type).nunique() > 1]
+    frame.astype({column: "string" for column in mixed}).to_parquet(filename, index=False, compression="zstd")
+
+
+# Table writers by format; the format is also the file extension. Register a function here to add one
+EXPORTERS: Dict[str, Callable[[pd.DataFrame, str], None]] = {
+    "json": export_json,
+    "csv": export_csv,
+    "parquet": export_parquet,
+}
+
+
+def export_tables(tables: Dict[str, pd.DataFrame], directory: str, formats: List[str]) -> List[str]:
+    """Write every table in every format as ``<directory>/<table>.<format>`` and return the files."""
+    unknown = [fmt for fmt in formats if fmt not in EXPORTERS]
+    if unknown:
+        raise ValueError(f"Unknown export format(s) {', '.join(unknown)}; choose from {', '.join(EXPORTERS)}")
+    os.makedirs(directory, exist_ok=True)
+    files = []
+    for name, frame in tables.items():
+        for fmt in formats:
+            filename = os.path.join(directory, f"{name}.{fmt}")
+            EXPORTERS[fmt](frame, filename)
+            files.append(filename)
+    return files
@@ -0,0 +1,75 @@
+from typing import List
+import numpy as np
+import pandas as pd
+
+# Lead time percentiles reported, in days
+LEAD_TIME_PERCENTILES = (50, 85, 95)
+
+SECONDS_PER_DAY = 86_400
+
+
+def day_numbers(timestamps: pd.Series) -> np.ndarray:
+    """UTC day of each timestamp as days since the epoch."""
+    return timestamps.dt.tz_convert(None).to_numpy().astype("datetime64[D]").astype(np.int64)
+
+
+def week_start(days: np.ndarray) -> np.ndarray:
+    """Monday of the week of each epoch day, the same start as ``period_start``."""
+    # 1970-01-01 was a Thursday, three days after a Monday
+    return days - (days + 3) % 7
+
+
+def event_counts(days: np.ndarray) -> pd.Series:
+    """Number of events on each epoch day, sorted by day."""
+    values, counts = np.unique(days, return_counts=True)
+    return pd.Series(counts, index=values, dtype=np.int64)
+
+
+def merge_counts(partials: List[pd.Series]) -> pd.Series:
+    """Sum per-day event counts computed on separate batches."""
+    partials = [p for p in partials if len(p)]
+    if not partials:
+        return pd.Series(dtype=np.int64)
+    return pd.concat(partials).groupby(level=0).sum()
+
+
+def lead_times(created_at: pd.Series, closed_at: pd.Series) -> np.ndarray:
+    """Days from creation to close of each issue; both series must be set."""
+    return (closed_at - created_at).dt.total_seconds().to_numpy() / SECONDS_PER_DAY
+
+
+def daily_wip(opened: pd.Series, closed: pd.Series) -> pd.DataFrame:
+    """Open issues at the end of each day, swept from per-day open and close counts.
+
+    Every day between the first and last event is present, so an issue
+    counts towards WIP from the day it is created until the day before it
+    is closed.
+    """
+    if len(opened) == 0:
+        return pd.DataFrame({"day": pd.Series(dtype="datetime64[ns]"), "wip": pd.Series(dtype=np.int64)})
+    first = opened.index[0]
+    last = max(opened.index[-1], closed.index[-1]) if len(closed) else opened.index[-1]
+    days = np.arange(first, last + 1)
+    delta = opened.reindex(days, fill_value=0).to_numpy() - closed.reindex(days, fill_value=0).to_numpy()
+    return pd.DataFrame({
+        "day": days.astype("datetime64[D]").astype("datetime64[ns]"),
+        "wip": np.cumsum(delta),
+    })
+
+
+def throughput_by_period(closed: pd.Series) -> pd.DataFrame:
+    """Issues closed in each weekly period, by close date."""
+    counts = closed.groupby(week_start(closed.index.to_numpy())).sum()
+    return pd.DataFrame({
+        "period": counts.index.to_numpy().astype("datetime64[D]").astype("datetime64[ns]"),
+        "throughput": counts.to_numpy(dtype=np.int64),
+    })
+
+
+def summarize_lead_times(lead: np.ndarray) -> dict:
+    """Mean and ``LEAD_TIME_PERCENTILES`` of the lead times, in days."""
+    summary = {'count': len(lead), 'mean': float(lead.mean()) if len(lead) else None}
+    values = np.percentile(lead, LEAD_TIME_PERCENTILES) if len(lead) else [None] * len(LEAD_TIME_PERCENTILES)
+    for q, value in zip(LEAD_TIME_PERCENTILES, values):
+        summary[f'p{q}'] = None if value is None else float(value)
+    return summary
@@ -0,0 +1,121 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime, timezone
+import os
+import duckdb
+import numpy as np
+import pandas as pd
+from .sync_store import _quote
+
+# Team name of the organization-wide forecast
+ORGANIZATION = "organização"
+
+# Tables of the history: one row per run, per run and period, and per run and team forecast
+HISTORY_TABLES = ("runs", "periods", "forecasts")
+
+FORECAST_PERCENTILES = ("p10", "p50", "p90")
+
+
+def utc_timestamp(run_at) -> pd.Timestamp:
+    """``run_at`` in UTC; naive times are taken to be UTC already."""
+    run_at = pd.Timestamp(run_at)
+    return run_at.tz_localize("UTC") if run_at.tzinfo is None else run_at.tz_convert("UTC")
+
+
+class HistoryStore(BaseModel):
+    """Append-only history of every run as ZSTD Parquet files partitioned by run date.
+
+    Each run adds ``<directory>/<table>/run_date=YYYY-MM-DD/<run id>.parquet``
+    files, which DuckDB reads lazily through ``query``.
+    """
+    directory: str = ".cache/reportify/history"
+
+    def append(self, table: str, frame: pd.DataFrame, run_at: datetime):
+        run_at = utc_timestamp(run_at)
+        folder = os.path.join(self.directory, table, f"run_date={run_at:%Y-%m-%d}")
+        os.makedirs(folder, exist_ok=True)
+        frame = frame.assign(run_at=run_at.tz_convert(None))
+        frame.to_parquet(os.path.join(folder, f"{run_at:%Y%m%dT%H%M%S%f}.parquet"), index=False, compression="zstd")
+
+    def record(self, runs: pd.DataFrame, periods: pd.DataFrame, forecasts: pd.DataFrame,
+               run_at: Optional[datetime] = None) -> datetime:
+        """Append one run's summary, per-period counts and forecasts."""
+        run_at = utc_timestamp(run_at or datetime.now(timezone.utc))
+        for table, frame in zip(HISTORY_TABLES, (runs, periods, forecasts)):
+            self.append(table, frame, run_at)
+        return run_at
+
+    def tables(self) -> List[str]:
+        return [table for table in HISTORY_TABLES if os.path.isdir(os.path.join(self.directory, table))]
+
+    def connect(self) -> duckdb.DuckDBPyConnection:
+        con = duckdb.connect(":memory:")
+        for table in self.tables():
+            files = _quote(os.path.join(self.directory, table, "*", "*.parquet"))
+            con.execute(f"CREATE VIEW \"{table}\" AS SELECT * FROM read_parquet('{files}', hive_partitioning = true, union_by_name = true)")
+        return con
+
+    def query(self, sql: str, params: Optional[list] = None) -> pd.DataFrame:
+        """Run a query over the history views; only the columns and partitions it reads are loaded."""
+        with self.connect() as con:
+            return con.execute(sql, params or []).df()
+
+
+def _days(values) -> np.ndarray:
+    """Days since the epoch of a datetime column; NaT becomes the int64 minimum."""
+    return pd.to_datetime(pd.Series(values)).to_numpy().astype("datetime64[D]").astype(np.int64)
+
+
+def backtest(forecasts: pd.DataFrame, closures: pd.DataFrame, as_of=None) -> pd.DataFrame:
+    """Replay forecasts against the actual closure dates.
+
+    ``forecasts`` holds ``team``, ``run_at``, ``remaining_work`` and the
+    ``completion_date_p10/p50/p90`` columns; ``closures`` one ``(team, closed)``
+    row per closed issue. The work remaining at a run is done on the day the
+    ``remaining_work``-th issue of the team closes after it, found for every
+    forecast at once with a binary search over ``(team, day)`` keys.
+
+    Adds ``actual_date`` (NaT while still open), ``error_days`` (actual minus
+    P50) and, for each percentile, ``hit_pXX`` (done by that date) and
+    ``known_pXX`` (done, or the date passed ``as_of`` without it being done).
+    """
+    teams = pd.Index(pd.unique(np.concatenate([forecasts["team"].to_numpy(), closures["team"].to_numpy()])))
+    # Team code in the high bits and day in the low bits sort closures by team, then date
+    keys = np.sort((teams.get_indexer(closures["team"]).astype(np.int64) << 32) + _days(closures["closed"]))
+    team = teams.get_indexer(forecasts["team"]).astype(np.int64)
+    remaining = forecasts["remaining_work"].to_numpy(dtype=np.int64)
+    start = np.searchsorted(keys, (team << 32) + _days(forecasts["run_at"]), side="right")
+    end = np.searchsorted(keys, (team + 1) << 32, side="left")
+    last = start + remaining - 1
+    done = (remaining > 0) & (last < end)
+
+    actual = np.full(len(forecasts), np.datetime64("NaT"), dtype="datetime64[D]")
+    actual[done] = (keys[last[done]] & 0xFFFFFFFF).astype("datetime64[D]")
+    as_of = np.datetime64(as_of or pd.to_datetime(closures["closed"]).max(), "D")
+
+    result = forecasts.assign(actual_date=pd.to_datetime(actual))
+    for percentile in FORECAST_PERCENTILES:
+        predicted = pd.to_datetime(forecasts[f"completion_date_{percentile}"]).to_numpy().astype("datetime64[D]")
+        has_date = ~np.isnat(predicted)
+        result[f"hit_{percentile}"] = done & has_date & (actual <= predicted)
+        result[f"known_{percentile}"] = has_date & (done | (predicted < as_of))
+    predicted = pd.to_datetime(forecasts["completion_date_p50"]).to_numpy().astype("datetime64[D]")
+    result["error_days"] = (actual - predicted).astype("timedelta64[D]").astype(np.float64)
+    result.loc[~done | np.isnat(predicted), "error_days"] = np.nan
+    return result
+
+
+def backtest_summary(replayed: pd.DataFrame) -> pd.DataFrame:
+    """Per team: forecasts replayed, how often each percentile held and the P50 error in days."""
+    columns = {"forecasts": ("run_at", "size"), "completed": ("actual_date", "count")}
+    for percentile in FORECAST_PERCENTILES:
+        columns[f"hit_{percentile}"] = (f"hit_{percentile}", "sum")
+        columns[f"known_{percentile}"] = (f"known_{percentile}", "sum")
+    summary = replayed.assign(abs_error_days=replayed["error_days"].abs()).groupby("team", sort=True).agg(
+        mean_error_days=("error_days", "mean"), mean_abs_error_days=("abs_error_days", "mean"), **columns
+    )
+    # Share of the forecasts with a known outcome that finished by each percentile's date
+    for percentile in FORECAST_PERCENTILES:
+        hits, known = summary.pop(f"hit_{percentile}"), summary.pop(f"known_{percentile}")
+        summary[f"hit_rate_{percentile}"] = (hits / known.where(known > 0) * 100).round(1)
+    return summary.round({"mean_error_days": 1, "mean_abs_error_days": 1}).reset_index()
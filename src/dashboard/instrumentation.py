@@ -0,0 +1,88 @@
+from pydantic import BaseModel, PrivateAttr
+from typing import List, Optional
+from contextlib import contextmanager
+import cProfile
+import json
+import os
+import resource
+import time
+
+
+def _cpu_seconds() -> float:
+    # Includes finished child processes such as the chart render pool
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class StageMetrics(BaseModel):
+    name: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    max_rss_mb: float = 0.0
+    rows: Optional[int] = None
+
+
+class Instrumentation(BaseModel):
+    """Collects wall time, CPU time, peak RSS and row counts for each pipeline stage.
+
+    Stages may be nested; an outer stage's figures include its inner stages.
+    """
+    stages: List[StageMetrics] = []
+    # When set, every stage is run under cProfile and dumped to <profile_dir>/<stage>.prof
+    profile_dir: Optional[str] = None
+    _profiling: bool = PrivateAttr(default=False)
+
+    @contextmanager
+    def stage(self, name: str):
+        metrics = StageMetrics(name=name)
+        # Only one profiler can be active, so nested stages are covered by the outer profile
+        profiler = cProfile.Profile() if self.profile_dir and not self._profiling else None
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_seconds()
+        if profiler:
+            self._profiling = True
+            profiler.enable()
+        try:
+            yield metrics
+        finally:
+            if profiler:
+                profiler.disable()
+                self._profiling = False
+                os.makedirs(self.profile_dir, exist_ok=True)
+                profiler.dump_stats(os.path.join(self.profile_dir, f"{name}.prof"))
+            metrics.wall_seconds = round(time.perf_counter() - wall_start, 4)
+            metrics.cpu_seconds = round(_cpu_seconds() - cpu_start, 4)
+            metrics.max_rss_mb = round(_max_rss_mb(), 1)
+            self.stages.append(metrics)
+
+    def save_json(self, filename: str):
+        with open(filename, "w") as f:
+            json.dump({"stages": [stage.model_dump() for stage in self.stages]}, f, indent=2)
+            f.write("\n")
+
+    def openmetrics(self) -> str:
+        """The stages in the OpenMetrics text format."""
+        lines = []
+        for field, help_text in [
+            ("wall_seconds", "Wall clock time spent in the stage."),
+            ("cpu_seconds", "CPU time spent in the stage, including child processes."),
+            ("max_rss_mb", "Process peak resident set size in MB at the end of the stage."),
+            ("rows", "Rows processed by the stage."),
+        ]:
+            metric = f"reportify_stage_{field}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"# HELP {metric} {help_text}")
+            for stage in self.stages:
+                value = getattr(stage, field)
+                if value is not None:
+                    lines.append(f'{metric}{{stage="{stage.name}"}} {value}')
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def save_openmetrics(self, filename: str):
+        with open(filename, "w") as f:
+            f.write(self.openmetrics())
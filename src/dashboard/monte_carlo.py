@@ -0,0 +1,243 @@
+from typing import List, NamedTuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
+
+# Each historical period is treated as a biweekly sprint when projecting dates
+DAYS_PER_PERIOD = 14
+
+# Upper bound on bootstrap cells (simulations x periods) drawn at once
+MAX_BATCH_CELLS = 4_000_000
+
+# Completion date percentiles watched by the adaptive mode
+CONVERGENCE_QUANTILES = (0.1, 0.5, 0.9)
+
+
+class AliasTable(NamedTuple):
+    """Vose alias table: weighted draws in O(1) each, after an O(n) build."""
+    prob: np.ndarray
+    alias: np.ndarray
+
+    @classmethod
+    def build(cls, weights: np.ndarray) -> "AliasTable":
+        weights = np.asarray(weights, dtype=np.float64)
+        n = len(weights)
+        scaled = weights * n / weights.sum()
+        prob = np.ones(n)
+        alias = np.arange(n)
+        small = [i for i in range(n) if scaled[i] < 1]
+        large = [i for i in range(n) if scaled[i] >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            # The large entry gives away what fills the small one's column
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+        return cls(prob, alias)
+
+    def sample(self, rng: np.random.Generator, size) -> np.ndarray:
+        """Indices drawn with probability proportional to the weights."""
+        column = rng.integers(0, len(self.prob), size=size)
+        return np.where(rng.random(size) < self.prob[column], column, self.alias[column])
+
+
+class SamplingPlan(NamedTuple):
+    """Which periods the bootstrap draws from and how many it draws per trial."""
+    velocities: np.ndarray
+    alias: Optional[AliasTable] = None
+    draws: Optional[int] = None
+
+
+def sampling_plan(velocities: np.ndarray, window: Optional[int] = None,
+                  half_life: Optional[float] = None) -> SamplingPlan:
+    """Restrict sampling to the last ``window`` periods and/or weight them by recency.
+
+    With ``half_life`` a period's weight halves every ``half_life`` periods
+    back. Each trial then draws as many periods as the weights' effective
+    sample size, so old periods with negligible weight cost nothing.
+    """
+    if window is not None and window <= 0:
+        raise ValueError(f"window must be a positive number of periods, not {window}")
+    if half_life is not None and half_life <= 0:
+        raise ValueError(f"half_life must be a positive number of periods, not {half_life}")
+    velocities = np.asarray(velocities, dtype=np.float64)
+    if window is not None:
+        velocities = velocities[-window:]
+    if half_life is None or len(velocities) == 0:
+        return SamplingPlan(velocities)
+    weights = 0.5 ** (np.arange(len(velocities))[::-1] / half_life)
+    effective_size = weights.sum() ** 2 / (weights ** 2).sum()
+    return SamplingPlan(velocities, AliasTable.build(weights), max(1, int(np.ceil(effective_size))))
+
+
+def simulate_velocities(velocities: np.ndarray, n_simulations: int, rng: np.random.Generator,
+                        max_batch_cells: int = MAX_BATCH_CELLS, alias: Optional[AliasTable] = None,
+                        draws: Optional[int] = None) -> np.ndarray:
+    """Draw bootstrap mean velocities for ``n_simulations`` trials.
+
+    Each trial averages ``draws`` periods (default: all of them), picked
+    uniformly or, with ``alias``, by the table's weights.
+    """
+    velocities = np.asarray(velocities, dtype=np.float64)
+    n_periods = draws or len(velocities)
+    simulated = np.empty(n_simulations, dtype=np.float64)
+
+    # Draw the (n_simulations, n_periods) sample matrix in row blocks to bound memory
+    rows_per_batch = max(1, max_batch_cells // max(n_periods, 1))
+    for start in range(0, n_simulations, rows_per_batch):
+        stop = min(start + rows_per_batch, n_simulations)
+        if alias is None:
+            samples = rng.choice(velocities, size=(stop - start, n_periods))
+        else:
+            samples = velocities[alias.sample(rng, (stop - start, n_periods))]
+        simulated[start:stop] = samples.mean(axis=1)
+
+    # Random factor applied to each trial's mean velocity
+    simulated *= rng.uniform(0.8, 1.2, size=n_simulations)
+    return simulated
+
+
+def completion_dates(periods_to_completion: np.ndarray, last_date: np.datetime64) -> np.ndarray:
+    """Convert periods to completion into ``datetime64[D]`` completion dates."""
+    days = (periods_to_completion * DAYS_PER_PERIOD).astype(np.int64)
+    return np.datetime64(last_date, "D") + days.astype("timedelta64[D]")
+
+
+def order_statistic(values: np.ndarray, q: float):
+    """Return the ``int(q * n)``-th smallest value, clipped to the last element."""
+    idx = min(int(q * len(values)), len(values) - 1)
+    return np.partition(values, idx)[idx]
+
+
+def simulate_until_stable(plan: SamplingPlan, remaining_work: float, rng: np.random.Generator,
+                          max_simulations: int, batch_size: int, tolerance_days: float):
+    """Draw positive simulated velocities in batches until the completion percentiles settle.
+
+    Stops once the P10/P50/P90 completion offsets (in days) move by at most
+    ``tolerance_days`` from one batch to the next, or after
+    ``max_simulations`` trials. Returns the velocities, the trials drawn and
+    whether the estimates converged.
+    """
+    if tolerance_days <= 0:
+        raise ValueError(f"tolerance_days must be a positive number of days, not {tolerance_days}")
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be a positive number of trials, not {batch_size}")
+    batches = []
+    previous = None
+    trials = 0
+    while trials < max_simulations:
+        size = min(batch_size, max_simulations - trials)
+        batch = simulate_velocities(plan.velocities, size, rng, alias=plan.alias, draws=plan.draws)
+        batches.append(batch[batch > 0])
+        trials += size
+        simulated = np.concatenate(batches)
+        if len(simulated) == 0:
+            continue
+        days = (remaining_work / simulated * DAYS_PER_PERIOD).astype(np.int64)
+        current = np.array([order_statistic(days, q) for q in CONVERGENCE_QUANTILES])
+        if previous is not None and np.abs(current - previous).max() <= tolerance_days:
+            return simulated, trials, True
+        previous = current
+    return np.concatenate(batches) if batches else np.empty(0), trials, False
+
+
+def forecast(velocities: np.ndarray, remaining_work: float, last_date: Optional[np.datetime64],
+             n_simulations: int, seed=None, tolerance_days: Optional[float] = None,
+             batch_size: int = 5_000, window: Optional[int] = None, half_life: Optional[float] = None) -> dict:
+    """Bootstrap the completion of ``remaining_work`` from historical period velocities.
+
+    ``seed`` is anything ``np.random.default_rng`` accepts, including a
+    ``SeedSequence`` child. With ``tolerance_days`` the trials are drawn in
+    batches of ``batch_size`` and ``n_simulations`` is only the upper bound
+    (see ``simulate_until_stable``). ``window`` and ``half_life`` choose the
+    history sampled (see ``sampling_plan``).
+    """
+    plan = sampling_plan(velocities, window, half_life)
+    velocities = plan.velocities
+
+    # If no work left, return completed status
+    if remaining_work <= 0:
+        return {
+            'velocity_mean': np.mean(velocities),
+            'velocity_p10': np.percentile(velocities, 10) if len(velocities) > 0 else 0,
+            'velocity_p50': np.percentile(velocities, 50) if len(velocities) > 0 else 0,
+            'velocity_p90': np.percentile(velocities, 90) if len(velocities) > 0 else 0,
+            'completion_date_p10': "Complete",
+            'completion_date_p50': "Complete",
+            'completion_date_p90': "Complete",
+            'simulated_velocities': np.empty(0),
+            'completion_dates': np.empty(0, dtype="datetime64[D]"),
+            'trials': 0,
+            'converged': None,
+        }
+
+    # Skip trials whose velocity is zero or negative
+    rng = np.random.default_rng(seed)
+    if tolerance_days is None:
+        simulated = simulate_velocities(velocities, n_simulations, rng, alias=plan.alias, draws=plan.draws)
+        simulated = simulated[simulated > 0]
+        trials, converged = n_simulations, None
+    else:
+        simulated, trials, converged = simulate_until_stable(
+            plan, remaining_work, rng, n_simulations, batch_size, tolerance_days
+        )
+    if len(simulated) == 0:
+        return {
+            'velocity_mean': np.mean(velocities) if len(velocities) > 0 else 0,
+            'velocity_p10': 0,
+            'velocity_p50': 0,
+            'velocity_p90': 0,
+            'completion_date_p10': None,
+            'completion_date_p50': None,
+            'completion_date_p90': None,
+            'simulated_velocities': np.empty(0),
+            'completion_dates': np.empty(0, dtype="datetime64[D]"),
+            'trials': trials,
+            'converged': converged,
+        }
+
+    dates = completion_dates(remaining_work / simulated, last_date)
+    velocity_p10, velocity_p50, velocity_p90 = np.percentile(simulated, [10, 50, 90])
+    return {
+        'velocity_mean': simulated.mean(),
+        'velocity_p10': velocity_p10,
+        'velocity_p50': velocity_p50,
+        'velocity_p90': velocity_p90,
+        'completion_date_p10': str(order_statistic(dates, 0.1)),
+        'completion_date_p50': str(order_statistic(dates, 0.5)),
+        'completion_date_p90': str(order_statistic(dates, 0.9)),
+        'simulated_velocities': simulated,
+        'completion_dates': dates,
+        'trials': trials,
+        'converged': converged,
+    }
+
+
+class ForecastInput(NamedTuple):
+    """History of one team: per-period delivered issues, open work and last period start."""
+    velocities: np.ndarray
+    remaining_work: float
+    last_date: Optional[np.datetime64]
+
+
+def _summary_forecast(item: ForecastInput, seed: np.random.SeedSequence, **options) -> dict:
+    # Only the summary travels back from the worker, not the simulated arrays
+    results = forecast(*item, seed=seed, **options)
+    return {k: v for k, v in results.items() if k not in ('simulated_velocities', 'completion_dates')}
+
+
+def forecast_many(items: List[ForecastInput], n_simulations: int, seed: Optional[int] = None,
+                  max_workers: Optional[int] = None, **options) -> List[dict]:
+    """Forecast several teams in a process pool, each with its own ``SeedSequence`` child.
+
+    Children are assigned by position in ``items``, so for a given seed the
+    results are identical whatever the number of workers. ``options`` are
+    passed on to ``forecast``.
+    """
+    children = np.random.SeedSequence(seed).spawn(len(items))
+    job = partial(_summary_forecast, n_simulations=n_simulations, **options)
+    if max_workers == 1 or len(items) <= 1:
+        return list(map(job, items, children))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(job, items, children))
@@ -0,0 +1,95 @@
+from typing import Callable, Dict, List, Optional, TextIO, Tuple, Union
+from contextlib import contextmanager
+import os
+import numpy as np
+import pandas as pd
+
+# When streaming to a file, buffered text is written out once it reaches this many characters
+CHUNK_CHARS = 1 << 20
+
+# A printf-style format applied to a whole column, or a function from the column to its text
+Formatter = Union[str, Callable[[pd.Series], pd.Series]]
+
+
+def format_column(values: pd.Series, formatter: Formatter) -> pd.Series:
+    """Format every cell of a column in one call."""
+    if callable(formatter):
+        text = formatter(values)
+    else:
+        text = np.char.mod(formatter, values.to_numpy())
+    return pd.Series(text, index=values.index, dtype=object)
+
+
+def markdown_table(header: str, frame: pd.DataFrame, columns: Dict[str, Formatter]) -> str:
+    """Render ``frame`` below a literal header, one vectorized format per column.
+
+    ``header`` holds the title and separator lines; ``columns`` maps each
+    column of ``frame`` to its cell format, in display order.
+    """
+    if len(frame) == 0:
+        return header
+    cells = [format_column(frame[column], formatter) for column, formatter in columns.items()]
+    rows = "| " + cells[0]
+    for cell in cells[1:]:
+        rows = rows + " | " + cell
+    return header + "\n".join(rows + " |") + "\n"
+
+
+def key_value_table(header: str, rows: List[Tuple[str, str]]) -> str:
+    """Render ``(label, value)`` rows as a two-column table."""
+    frame = pd.DataFrame(rows, columns=["label", "value"])
+    return markdown_table(header, frame, {"label": "%s", "value": "%s"})
+
+
+class MarkdownReport:
+    """A markdown document built from parts that are joined once instead of concatenated.
+
+    With ``stream`` the parts are written out in chunks of about
+    ``chunk_chars`` characters, so large reports never sit in memory whole.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, chunk_chars: int = CHUNK_CHARS):
+        self.stream = stream
+        self.chunk_chars = chunk_chars
+        self.lines = 0
+        self._parts: List[str] = []
+        self._size = 0
+
+    @classmethod
+    @contextmanager
+    def open(cls, filename: str, chunk_chars: int = CHUNK_CHARS):
+        """Stream a report to ``filename``, which is only replaced once the whole report is written."""
+        partial = filename + ".tmp"
+        try:
+            with open(partial, "w") as f:
+                report = cls(f, chunk_chars)
+                yield report
+                report.flush()
+            os.replace(partial, filename)
+        finally:
+            # Left behind only when the report failed part-way
+            if os.path.exists(partial):
+                os.remove(partial)
+
+    def write(self, *parts: str):
+        for part in parts:
+            self._parts.append(part)
+            self._size += len(part)
+            self.lines += part.count("\n")
+        if self.stream is not None and self._size >= self.chunk_chars:
+            self.flush()
+
+    def table(self, header: str, frame: pd.DataFrame, columns: Dict[str, Formatter]):
+        self.write(markdown_table(header, frame, columns))
+
+    def flush(self):
+        if self.stream is not None and self._parts:
+            self.stream.write("".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+
+    def getvalue(self) -> str:
+        """The whole document; only for reports kept in memory."""
+        if self.stream is not None:
+            raise RuntimeError("Report is streamed to a file")
+        return "".join(self._parts)
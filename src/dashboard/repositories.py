@@ -0,0 +1,112 @@
+from typing import List, Optional
+from fnmatch import fnmatch
+import time
+import requests
+
+GITHUB_API = "https://api.github.com"
+
+# Attempts of a single API call that hits the secondary or primary rate limit
+RATE_LIMIT_RETRIES = 5
+
+
+def _headers(token: str) -> dict:
+    headers = {"Accept": "application/vnd.github+json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def rate_limit_delay(response: requests.Response, attempt: int = 0) -> Optional[float]:
+    """Seconds to wait before retrying a rate limited response, or None if it was not rate limited.
+
+    Honors ``Retry-After`` first, then ``X-RateLimit-Reset`` when no calls
+    are left, and otherwise backs off exponentially as GitHub recommends
+    for secondary limits.
+    """
+    if response.status_code not in (403, 429):
+        return None
+    headers = response.headers
+    if "Retry-After" in headers:
+        return float(headers["Retry-After"])
+    if headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in headers:
+        return max(0, int(headers["X-RateLimit-Reset"]) - time.time()) + 1
+    if response.status_code == 429 or "rate limit" in response.text.lower():
+        return 60 * 2 ** attempt
+    return None
+
+
+def github_get(url: str, token: str, params: Optional[dict] = None) -> requests.Response:
+    """GET a GitHub API url, sleeping through rate limits instead of failing."""
+    for attempt in range(RATE_LIMIT_RETRIES):
+        response = requests.get(url, headers=_headers(token), params=params, timeout=30)
+        delay = rate_limit_delay(response, attempt)
+        if delay is None:
+            return response
+        print(f"⏳ Limite da API atingido, aguardando {int(delay)}s...")
+        time.sleep(delay)
+    return response
+
+
+def list_owner_repositories(owner: str, token: str) -> List[str]:
+    """List the full names of every repository of an organization or user."""
+    names = []
+    for kind in ("orgs", "users"):
+        page = 1
+        while True:
+            response = github_get(f"{GITHUB_API}/{kind}/{owner}/repos", token, {"per_page": 100, "page": page})
+            if response.status_code == 404:
+                break
+            response.raise_for_status()
+            repos = response.json()
+            names.extend(repo["full_name"] for repo in repos)
+            if len(repos) < 100:
+                return names
+            page += 1
+    return names
+
+
+def resolve_repositories(spec: str, token: str, known: Optional[List[str]] = None) -> List[str]:
+    """Expand a comma separated list of repositories, globs or owner names.
+
+    ``owner/repo`` is used as is, ``owner/api-*`` is matched against the
+    owner's repositories and a bare ``owner`` selects all of them. When
+    ``known`` is given, patterns are matched against it instead of the
+    GitHub API.
+    """
+    patterns = [p.strip() for p in spec.replace("\n", ",").split(",") if p.strip()]
+    repositories = []
+    owners = {}
+    for pattern in patterns:
+        if "/" not in pattern:
+            pattern = f"{pattern}/*"
+        if not any(c in pattern for c in "*?["):
+            repositories.append(pattern)
+            continue
+        owner = pattern.split("/", 1)[0]
+        if owner not in owners:
+            owners[owner] = known if known is not None else list_owner_repositories(owner, token)
+        repositories.extend(name for name in owners[owner] if fnmatch(name.lower(), pattern.lower()))
+    # Keep the first occurrence of each repository
+    return list(dict.fromkeys(repositories))
+
+
+def core_rate_limit_delay(token: str, min_remaining: int = 100) -> float:
+    """Seconds until the core rate limit resets when fewer than ``min_remaining`` calls are left, else 0."""
+    # /rate_limit itself does not count against the limit
+    try:
+        response = requests.get(f"{GITHUB_API}/rate_limit", headers=_headers(token), timeout=30)
+        response.raise_for_status()
+        core = response.json()["resources"]["core"]
+    except (requests.RequestException, KeyError, ValueError):
+        return 0
+    if core["remaining"] < min_remaining:
+        return max(0, core["reset"] - time.time()) + 1
+    return 0
+
+
+def wait_for_rate_limit(token: str, min_remaining: int = 100):
+    """Sleep until the core rate limit resets when fewer than ``min_remaining`` calls are left."""
+    delay = core_rate_limit_delay(token, min_remaining)
+    if delay:
+        print(f"⏳ Limite da API quase esgotado, aguardando {int(delay)}s...")
+        time.sleep(delay)
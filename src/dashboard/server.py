@@ -0,0 +1,210 @@
+from typing import Any, Callable, Optional, Tuple
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+import hashlib
+import hmac
+import json
+import mimetypes
+import os
+import threading
+import time
+
+# A served response: content type and body
+Content = Tuple[str, bytes]
+
+
+class TTLCache:
+    """Least recently used cache whose entries also expire ``ttl`` seconds after being stored."""
+
+    def __init__(self, max_entries: int = 128, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DashboardService:
+    """Keeps an analyzed dashboard in memory and serves its report, charts and metrics.
+
+    ``factory`` builds a fresh dashboard for every refresh; the previous one
+    keeps being served until the new one is analyzed. Rendered responses are
+    cached until the next refresh or for at most ``cache_ttl`` seconds.
+    """
+
+    def __init__(self, factory: Callable[[], Any], refresh_interval: Optional[float] = None,
+                 cache_entries: int = 128, cache_ttl: float = 300.0, webhook_secret: Optional[str] = None):
+        self.factory = factory
+        self.refresh_interval = refresh_interval
+        self.webhook_secret = webhook_secret
+        self.cache = TTLCache(cache_entries, cache_ttl)
+        self.dashboard = None
+        self.results = None
+        self.refreshed_at: Optional[float] = None
+        self._state_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        # Rendering writes the chart files, so only one render runs at a time
+        self._render_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def refresh(self) -> bool:
+        """Build and analyze a new dashboard, then swap it in. False when a refresh is already running."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            dashboard = self.factory()
+            results = dashboard.analyze()
+            with self._state_lock:
+                self.dashboard, self.results = dashboard, results
+                self.refreshed_at = time.time()
+                self.cache.clear()
+            print(f"♻️ Dashboard atualizado: {results['stats']['total']} issues.")
+        except Exception as e:
+            print(f"❌ Erro ao atualizar o dashboard: {str(e)}")
+        finally:
+            self._refresh_lock.release()
+        return True
+
+    def refresh_in_background(self) -> bool:
+        if self._refresh_lock.locked():
+            return False
+        threading.Thread(target=self.refresh, daemon=True).start()
+        return True
+
+    def start_schedule(self):
+        """Refresh every ``refresh_interval`` seconds until ``stop()``."""
+        if not self.refresh_interval:
+            return
+
+        def loop():
+            while not self._stop.wait(self.refresh_interval):
+                self.refresh()
+
+        threading.Thread(target=loop, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def verify_webhook(self, body: bytes, signature: Optional[str]) -> bool:
+        """Check GitHub's ``X-Hub-Signature-256`` header when a webhook secret is set."""
+        if not self.webhook_secret:
+            return True
+        expected = "sha256=" + hmac.new(self.webhook_secret.encode(), body, hashlib.sha256).hexdigest()
+        return signature is not None and hmac.compare_digest(expected, signature)
+
+    def status(self) -> dict:
+        return {
+            'ready': self.results is not None,
+            'refreshing': self._refresh_lock.locked(),
+            'refreshed_at': self.refreshed_at,
+        }
+
+    def content(self, path: str) -> Optional[Content]:
+        """Response for ``path``, from the cache when fresh. None when there is nothing to serve."""
+        cached = self.cache.get(path)
+        if cached is not None:
+            return cached
+        with self._state_lock:
+            dashboard, results = self.dashboard, self.results
+        if results is None:
+            return None
+        content = self.render(path, dashboard, results)
+        if content is not None:
+            self.cache.put(path, content)
+        return content
+
+    def render(self, path: str, dashboard, results: dict) -> Optional[Content]:
+        if path == "/summary.json":
+            return "application/json", dashboard.summary_json(results).encode()
+        if path == "/metrics":
+            return "text/plain; version=0.0.4", dashboard.instrumentation.openmetrics().encode()
+        if path == "/report.md":
+            with self._render_lock:
+                markdown = dashboard.generate_markdown_report(
+                    results['stats'], results['weekly_data'], results['mc_results'], results['repo_stats'],
+                    results['flow'], results['breakdowns'], results['team_forecasts'],
+                )
+            return "text/markdown; charset=utf-8", markdown.encode()
+        # Charts are served where the report's relative links point
+        charts = f"/{os.path.basename(os.path.normpath(dashboard.output_dir))}/"
+        if path.startswith(charts):
+            # Charts are drawn with the report, which is cached once rendered
+            self.content("/report.md")
+            filename = os.path.join(dashboard.output_dir, os.path.basename(path))
+            if not os.path.isfile(filename):
+                return None
+            with open(filename, "rb") as f:
+                return mimetypes.guess_type(filename)[0] or "application/octet-stream", f.read()
+        return None
+
+
+def make_handler(service: DashboardService):
+    class DashboardHandler(BaseHTTPRequestHandler):
+        def send(self, status: int, content_type: str, body: bytes):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_json(self, status: int, value: dict):
+            self.send(status, "application/json", json.dumps(value).encode())
+
+        def do_GET(self):
+            path = urlsplit(self.path).path
+            if path == "/health":
+                return self.send_json(200, service.status())
+            content = service.content(path)
+            if content is None:
+                status = 503 if service.results is None else 404
+                return self.send_json(status, {'error': "not ready" if status == 503 else "not found"})
+            self.send(200, *content)
+
+        def do_POST(self):
+            if urlsplit(self.path).path != "/refresh":
+                return self.send_json(404, {'error': "not found"})
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if not service.verify_webhook(body, self.headers.get("X-Hub-Signature-256")):
+                return self.send_json(401, {'error': "invalid signature"})
+            started = service.refresh_in_background()
+            self.send_json(202 if started else 409, {'refreshing': True, 'started': started})
+
+    return DashboardHandler
+
+
+def serve(service: DashboardService, host: str = "127.0.0.1", port: int = 8000):
+    """Analyze once, then serve until interrupted, refreshing on schedule or on ``POST /refresh``."""
+    service.refresh()
+    service.start_schedule()
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"🌐 Servindo o dashboard em http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
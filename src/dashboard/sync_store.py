@@ -0,0 +1,304 @@
+from pydantic import BaseModel, PrivateAttr
+from typing import Dict, Iterable, Iterator, List, Optional
+from datetime import datetime, timezone
+import json
+import os
+import threading
+import duckdb
+import pandas as pd
+import pyarrow.compute as pc
+
+# Cursor column used for incremental sync of each stream
+CURSOR_FIELDS = {
+    "issues": "updated_at",
+    "comments": "updated_at",
+    "reviews": "updated_at",
+}
+DEFAULT_CURSOR_FIELD = "updated_at"
+
+# Streams the connector returns in ascending cursor order, so the cursor can be
+# checkpointed after every batch and an interrupted sync resumes where it stopped
+CHECKPOINT_STREAMS = {"issues", "comments"}
+
+# Row counts kept up to date by every upsert: table -> (stream, {column: expression over the stream})
+AGGREGATES = {
+    # date_trunc('week') starts on Monday in UTC, like the 2W period start_time
+    "issue_periods": ("issues", {
+        "repository": "repository",
+        "period": "CAST(date_trunc('week', CAST(created_at AS TIMESTAMP)) AS TIMESTAMP)",
+        "state": "state",
+    }),
+}
+
+
+def cursor_field(stream: str) -> str:
+    return CURSOR_FIELDS.get(stream, DEFAULT_CURSOR_FIELD)
+
+
+def checkpoints(stream: str) -> bool:
+    return stream in CHECKPOINT_STREAMS
+
+
+def to_text(value) -> Optional[str]:
+    """Serialize a record value to the text form kept in the store."""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, default=str)
+
+
+def dictionary_encode(data, categories: Iterable[str]):
+    """Dictionary-encode the ``categories`` columns of an Arrow table or record batch.
+
+    They reach pandas as categoricals holding each distinct text once,
+    instead of one Python string per row.
+    """
+    for column in categories:
+        index = data.schema.get_field_index(column)
+        if index >= 0:
+            data = data.set_column(index, column, pc.dictionary_encode(data.column(index)))
+    return data
+
+
+def _quote(literal: str) -> str:
+    return literal.replace("'", "''")
+
+
+def _identifier(name: str) -> str:
+    return f'"{name}"'
+
+
+def aggregate_sql(source: str, columns: Dict[str, str], sign: int = 1) -> str:
+    """Group ``source`` by the aggregate's columns, counting rows as ``sign * count(*)``."""
+    expressions = ", ".join(f'{expression} AS "{column}"' for column, expression in columns.items())
+    return f"SELECT {expressions}, {sign} * count(*) AS row_count FROM {source} GROUP BY ALL"
+
+
+class SyncStore(BaseModel):
+    """Persistent DuckDB store for synced GitHub streams and their cursors."""
+    path: str = ".cache/reportify/reportify.duckdb"
+    key: str = "id"
+    # Serializes writes coming from concurrent repository syncs
+    _lock: threading.RLock = PrivateAttr(default_factory=threading.RLock)
+
+    def connect(self) -> duckdb.DuckDBPyConnection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        con = duckdb.connect(self.path)
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS sync_state ("
+            "stream VARCHAR, repository VARCHAR, cursor VARCHAR, synced_at VARCHAR, "
+            "PRIMARY KEY (stream, repository))"
+        )
+        return con
+
+    def has_stream(self, stream: str) -> bool:
+        with self.connect() as con:
+            return stream in self._tables(con)
+
+    def get_cursor(self, stream: str, repository: str) -> Optional[str]:
+        with self.connect() as con:
+            row = con.execute(
+                "SELECT cursor FROM sync_state WHERE stream = ? AND repository = ?",
+                [stream, repository],
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, stream: str, repository: str, cursor: Optional[str]):
+        synced_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        with self._lock, self.connect() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)",
+                [stream, repository, cursor, synced_at],
+            )
+
+    def records_to_frame(self, records: List[dict], repository: str) -> pd.DataFrame:
+        """Build a text-typed frame from raw records, tagging each with its repository."""
+        rows = [
+            {k: to_text(v) for k, v in dict(record).items() if not k.startswith("_airbyte")}
+            for record in records
+        ]
+        frame = pd.DataFrame(rows)
+        if "repository" not in frame.columns:
+            frame["repository"] = repository
+        else:
+            frame["repository"] = frame["repository"].fillna(repository)
+        return frame
+
+    def upsert(self, stream: str, frame: pd.DataFrame):
+        """Insert or replace rows of ``frame`` in the stream table, keyed by ``self.key``."""
+        if frame is None or len(frame) == 0:
+            return
+        # A row updated mid-sync can come twice in one delta; keep its latest version
+        cursor = cursor_field(stream)
+        if cursor in frame.columns:
+            frame = frame.sort_values(cursor, kind="stable", na_position="first")
+        frame = frame.drop_duplicates(self.key, keep="last")
+        columns = ", ".join(f'CAST("{c}" AS VARCHAR) AS "{c}"' for c in frame.columns)
+        with self._lock, self.connect() as con:
+            con.register("delta_frame", frame)
+            con.execute(f"CREATE OR REPLACE TEMP TABLE delta AS SELECT {columns} FROM delta_frame")
+            if stream not in self._tables(con):
+                con.execute(f'CREATE TABLE "{stream}" AS SELECT * FROM delta')
+                self._materialize_aggregates(con, stream)
+                return
+            # Evolve the schema when new fields show up in the source
+            existing = {row[0] for row in con.execute(f'DESCRIBE "{stream}"').fetchall()}
+            for column in frame.columns:
+                if column not in existing:
+                    con.execute(f'ALTER TABLE "{stream}" ADD COLUMN "{column}" VARCHAR')
+            self._materialize_aggregates(con, stream)
+            self._update_aggregates(con, stream)
+            con.execute(f'DELETE FROM "{stream}" WHERE "{self.key}" IN (SELECT "{self.key}" FROM delta)')
+            con.execute(f'INSERT INTO "{stream}" BY NAME SELECT * FROM delta')
+
+    def clear(self, stream: str, repository: str):
+        """Drop the stored rows and cursor of one repository for a full refresh."""
+        with self._lock, self.connect() as con:
+            if stream in self._tables(con):
+                con.execute(f'DELETE FROM "{stream}" WHERE repository = ?', [repository])
+            for table, (source, columns) in AGGREGATES.items():
+                if source == stream and "repository" in columns and table in self._tables(con):
+                    con.execute(f'DELETE FROM "{table}" WHERE repository = ?', [repository])
+            con.execute("DELETE FROM sync_state WHERE stream = ? AND repository = ?", [stream, repository])
+
+    def to_pandas(self, stream: str, columns: Optional[List[str]] = None, casts: Optional[Dict[str, str]] = None,
+                  categories: Iterable[str] = (), repositories: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load a stream, projected to ``columns`` when given.
+
+        ``casts`` maps columns to the SQL type the store converts them to,
+        ``categories`` are loaded as pandas categoricals and ``repositories``
+        keeps only their rows.
+        """
+        with self.connect() as con:
+            sql, params = self._select(con, stream, columns, casts, repositories)
+            return dictionary_encode(con.execute(sql, params).fetch_arrow_table(), categories).to_pandas()
+
+    def query(self, sql: str, params: Optional[list] = None) -> pd.DataFrame:
+        """Run a read query against the store and return the result as a frame."""
+        with self.connect() as con:
+            return con.execute(sql, params or []).df()
+
+    def iter_batches(self, stream: str, columns: Optional[List[str]] = None,
+                     batch_size: int = 100_000, casts: Optional[Dict[str, str]] = None,
+                     categories: Iterable[str] = (), repositories: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """Yield a stream as frames of at most ``batch_size`` rows through Arrow record batches.
+
+        Takes the same options as ``to_pandas``.
+        """
+        with self.connect() as con:
+            sql, params = self._select(con, stream, columns, casts, repositories)
+            reader = con.execute(sql, params).fetch_record_batch(batch_size)
+            for batch in reader:
+                yield dictionary_encode(batch, categories).to_pandas()
+
+    def aggregate_source(self, table: str) -> str:
+        """SQL relation for an aggregate: its maintained table, or the equivalent GROUP BY."""
+        with self.connect() as con:
+            if table in self._tables(con):
+                return f'"{table}"'
+        stream, columns = AGGREGATES[table]
+        return f'({aggregate_sql(_identifier(stream), columns)})'
+
+    def repositories(self, stream: str) -> List[str]:
+        """List the repositories that have rows in a stream."""
+        with self.connect() as con:
+            if stream not in self._tables(con):
+                return []
+            return [row[0] for row in con.execute(f'SELECT DISTINCT repository FROM "{stream}" ORDER BY 1').fetchall()]
+
+    def export_parquet(self, stream: str, filename: str):
+        """Write a stream to a Parquet file that a SnapshotStore can replay."""
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        with self.connect() as con:
+            con.execute(f"COPY \"{stream}\" TO '{_quote(filename)}' (FORMAT PARQUET, COMPRESSION ZSTD)")
+
+    def _select(self, con: duckdb.DuckDBPyConnection, stream: str, columns: Optional[List[str]],
+                casts: Optional[Dict[str, str]] = None, repositories: Optional[List[str]] = None):
+        """SQL and parameters selecting ``columns`` of a stream (see ``to_pandas``)."""
+        existing = {row[0] for row in con.execute(f'DESCRIBE "{stream}"').fetchall()}
+        casts = casts or {}
+
+        def project(column: str) -> str:
+            # Fields the source never sent are projected as NULL
+            value = f'"{column}"' if column in existing else "CAST(NULL AS VARCHAR)"
+            if column in casts:
+                value = f"CAST({value} AS {casts[column]})"
+            return f'{value} AS "{column}"'
+
+        projection = "*" if columns is None else ", ".join(map(project, columns))
+        sql = f'SELECT {projection} FROM "{stream}"'
+        if not repositories:
+            return sql, []
+        return sql + " WHERE list_contains(?, repository)", [repositories]
+
+    def _tables(self, con: duckdb.DuckDBPyConnection) -> set:
+        return {row[0] for row in con.execute("SHOW TABLES").fetchall()}
+
+    def _materialize_aggregates(self, con: duckdb.DuckDBPyConnection, stream: str):
+        """Create the missing aggregates of a stream from every row stored so far."""
+        tables = self._tables(con)
+        for table, (source, columns) in AGGREGATES.items():
+            if source == stream and table not in tables:
+                con.execute(f'CREATE TABLE "{table}" AS {aggregate_sql(_identifier(stream), columns)}')
+
+    def _update_aggregates(self, con: duckdb.DuckDBPyConnection, stream: str):
+        """Fold the pending ``delta`` rows into the aggregates before they replace the stored rows.
+
+        Only the groups touched by the replaced and the new rows are rewritten.
+        """
+        replaced = f'(SELECT * FROM "{stream}" WHERE "{self.key}" IN (SELECT "{self.key}" FROM delta))'
+        for table, (source, columns) in AGGREGATES.items():
+            if source != stream:
+                continue
+            keys = ", ".join(f'"{c}"' for c in columns)
+            matches = " AND ".join(f'"{table}"."{c}" IS NOT DISTINCT FROM changes."{c}"' for c in columns)
+            con.execute(f"""
+                CREATE OR REPLACE TEMP TABLE changes AS
+                SELECT {keys}, sum(row_count) AS row_count FROM (
+                    {aggregate_sql(replaced, columns, -1)}
+                    UNION ALL
+                    {aggregate_sql("delta", columns)}
+                ) GROUP BY ALL
+            """)
+            con.execute(f"""
+                CREATE OR REPLACE TEMP TABLE merged AS
+                SELECT {keys}, sum(row_count) AS row_count FROM (
+                    SELECT "{table}".* FROM "{table}" SEMI JOIN changes ON {matches}
+                    UNION ALL
+                    SELECT * FROM changes
+                ) GROUP BY ALL
+            """)
+            con.execute(f'DELETE FROM "{table}" USING changes WHERE {matches}')
+            con.execute(f'INSERT INTO "{table}" SELECT * FROM merged WHERE row_count <> 0')
+
+
+class SnapshotStore(SyncStore):
+    """Read-only store over ``<directory>/<stream>.parquet`` files written by ``export_parquet``."""
+    directory: str
+    path: str = ":memory:"
+
+    def connect(self) -> duckdb.DuckDBPyConnection:
+        con = duckdb.connect(":memory:")
+        for stream, filename in self.snapshots().items():
+            con.execute(f"CREATE VIEW \"{stream}\" AS SELECT * FROM read_parquet('{_quote(filename)}')")
+        return con
+
+    def snapshots(self) -> Dict[str, str]:
+        if not os.path.isdir(self.directory):
+            return {}
+        return {
+            name[:-len(".parquet")]: os.path.join(self.directory, name)
+            for name in sorted(os.listdir(self.directory))
+            if name.endswith(".parquet")
+        }
+
+    def upsert(self, stream: str, frame: pd.DataFrame):
+        raise RuntimeError("Snapshots are read-only")
+
+    def clear(self, stream: str, repository: str):
+        raise RuntimeError("Snapshots are read-only")
+
+    def get_cursor(self, stream: str, repository: str) -> Optional[str]:
+        return None
+
+    def set_cursor(self, stream: str, repository: str, cursor: Optional[str]):
+        raise RuntimeError("Snapshots are read-only")
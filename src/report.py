@@ -1,6 +1,236 @@
-from dashboard.dashboard_organization import OrganizationalDashboard
+"""Reportify command line.
+
+    python report.py                 fetch, analyze and render in one go
+    python report.py fetch           sync the local store from GitHub
+    python report.py analyze         compute stats and forecasts from the local store
+    python report.py render          rebuild the markdown report and charts from the local store
+    python report.py collaboration   developer collaboration network report
+    python report.py serve           keep the dashboard in memory and serve it over HTTP
+    python report.py backtest        replay recorded forecasts against the issues closed since
+
+Heavy modules are imported inside each command, so ``--help`` and the
+commands that do not fetch or draw start without airbyte or matplotlib.
+"""
+import argparse
+import importlib
+import os
+
+# Default history location, next to the sync store that the workflow caches
+HISTORY_DIR = ".cache/reportify/history"
+
+# Modules each command needs; benchmarks/startup_time.py measures them against a budget
+COMMAND_MODULES = {
+    "fetch": ["dashboard.dashboard_organization", "airbyte"],
+    "analyze": ["dashboard.dashboard_organization"],
+    # Imported before the render pool forks so workers inherit matplotlib
+    "render": ["dashboard.dashboard_organization", "matplotlib.figure", "matplotlib.backends.backend_agg"],
+}
+COMMAND_MODULES["collaboration"] = ["dashboard.dashboard_collaboration"]
+COMMAND_MODULES["report"] = list(dict.fromkeys(COMMAND_MODULES["fetch"] + COMMAND_MODULES["render"]))
+COMMAND_MODULES["serve"] = COMMAND_MODULES["render"] + ["dashboard.server"]
+COMMAND_MODULES["backtest"] = COMMAND_MODULES["analyze"]
+
+
+def positive(kind):
+    """argparse type for a number greater than zero."""
+    def parse(value: str):
+        number = kind(value)
+        if number <= 0:
+            raise argparse.ArgumentTypeError(f"must be greater than zero, not {value}")
+        return number
+    return parse
+
+
+def import_command_modules(command: str):
+    for module in COMMAND_MODULES[command]:
+        importlib.import_module(module)
+
+
+def build_dashboard(args, **kwargs):
+    from dashboard.dashboard_organization import OrganizationalDashboard
+    from dashboard.instrumentation import Instrumentation
+    return OrganizationalDashboard(
+        snapshot_dir=args.snapshot,
+        instrumentation=Instrumentation(profile_dir=args.profile),
+        monte_carlo_seed=args.seed,
+        monte_carlo_tolerance_days=args.tolerance_days,
+        velocity_window=args.window,
+        velocity_half_life=args.half_life,
+        history_dir=args.history,
+        export_formats=args.export,
+        export_dir=args.export_dir,
+        chart_format=args.chart_format,
+        chart_max_width=args.chart_max_width,
+        **kwargs,
+    )
+
+
+def fetch(args):
+    import_command_modules("fetch")
+    # Only sync: nothing is aggregated while fetching, since nothing is reported
+    dashboard = build_dashboard(args, incremental=not args.full_refresh, pipeline=False)
+    dashboard.load_cache()
+    dashboard.save_metrics()
+    if args.save_snapshot:
+        dashboard.save_snapshot(args.save_snapshot)
+
+
+def analyze(args):
+    import_command_modules("analyze")
+    dashboard = build_dashboard(args, offline=True)
+    results = dashboard.analyze()
+    text = dashboard.summary_json(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        print(f"✅ Análise salva em {args.output}")
+    else:
+        print(text)
+    if args.history:
+        dashboard.save_history(results)
+    if args.export:
+        dashboard.export(results)
+    dashboard.save_metrics()
+
+
+def backtest(args):
+    import_command_modules("backtest")
+    args.history = args.history or HISTORY_DIR
+    summary = build_dashboard(args, offline=True).backtest_history()
+    if args.output:
+        summary.to_json(args.output, orient="records", indent=2, date_format="iso")
+        print(f"✅ Backtest salvo em {args.output}")
+    else:
+        print(summary.to_string(index=False))
+
+
+def render(args):
+    import_command_modules("render")
+    build_dashboard(args, offline=True).run()
+
+
+def collaboration(args):
+    import_command_modules("collaboration")
+    from dashboard.dashboard_collaboration import CollaborationDashboard
+    from dashboard.instrumentation import Instrumentation
+    dashboard = CollaborationDashboard(
+        offline=args.offline,
+        snapshot_dir=args.snapshot,
+        instrumentation=Instrumentation(profile_dir=args.profile),
+    )
+    dashboard.run()
+    if args.save_snapshot:
+        dashboard.save_snapshot(args.save_snapshot)
+
+
+def report(args):
+    import_command_modules("report")
+    dashboard = build_dashboard(args, offline=args.offline)
+    dashboard.run()
+    if args.save_snapshot:
+        dashboard.save_snapshot(args.save_snapshot)
+
+
+def serve(args):
+    import_command_modules("serve")
+    from dashboard.server import DashboardService, serve as serve_http
+    service = DashboardService(
+        lambda: build_dashboard(args, offline=args.offline),
+        refresh_interval=args.refresh_interval,
+        cache_ttl=args.cache_ttl,
+        webhook_secret=os.getenv("WEBHOOK_SECRET"),
+    )
+    serve_http(service, args.host, args.port)
+
+
+def common_options(command: bool = False) -> argparse.ArgumentParser:
+    """Options accepted before and after the command.
+
+    The copies attached to commands default to ``SUPPRESS``, so they only
+    override an option given before the command when given themselves.
+    """
+    def default(value):
+        return argparse.SUPPRESS if command else value
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--profile", nargs="?", const="profiles", default=default(None), metavar="DIR",
+                        help="dump a cProfile file per stage into DIR (default: profiles)")
+    common.add_argument("--snapshot", default=default(None), metavar="DIR",
+                        help="read data from a Parquet snapshot instead of the store (no network)")
+    common.add_argument("--seed", type=int, default=default(None),
+                        help="seed the Monte Carlo forecasts so runs on the same data give the same dates")
+    common.add_argument("--tolerance-days", type=positive(float), default=default(None), metavar="DAYS",
+                        help="simulate in batches until the P10/P50/P90 dates move less than DAYS")
+    common.add_argument("--window", type=positive(int), default=default(None), metavar="N",
+                        help="forecast from the last N periods only")
+    common.add_argument("--half-life", type=positive(float), default=default(None), metavar="PERIODS",
+                        help="weight periods by recency, halving every PERIODS periods back")
+    common.add_argument("--history", nargs="?", const=HISTORY_DIR, default=default(None), metavar="DIR",
+                        help=f"append the run's stats and forecasts to the Parquet history in DIR (default: {HISTORY_DIR})")
+    common.add_argument("--export", type=lambda value: value.split(","), default=default([]), metavar="FORMAT[,FORMAT]",
+                        help="also write the result tables as json, csv and/or parquet")
+    common.add_argument("--export-dir", default=default("organization_data"), metavar="DIR",
+                        help="directory of the exported tables (default: organization_data)")
+    common.add_argument("--chart-format", choices=["png", "svg", "webp"], default=default("png"),
+                        help="chart image format (default: png)")
+    common.add_argument("--chart-max-width", type=int, default=default(None), metavar="PIXELS",
+                        help="cap the chart width, lowering the resolution")
+    return common
+
+
+def save_snapshot_options(command: bool = False) -> argparse.ArgumentParser:
+    save_snapshot = argparse.ArgumentParser(add_help=False)
+    save_snapshot.add_argument("--save-snapshot", default=argparse.SUPPRESS if command else None, metavar="DIR",
+                               help="write a Parquet snapshot of the fetched data")
+    return save_snapshot
+
+
+def main():
+    common, save_snapshot = common_options(command=True), save_snapshot_options(command=True)
+    parser = argparse.ArgumentParser(description="Generate the organization issue report.",
+                                     parents=[common_options(), save_snapshot_options()])
+    parser.add_argument("--offline", action="store_true",
+                        help="do not fetch; rebuild the report from the local store")
+    parser.set_defaults(func=report)
+    commands = parser.add_subparsers(title="commands")
+
+    fetch_parser = commands.add_parser("fetch", parents=[common, save_snapshot], help="sync the local store from GitHub")
+    fetch_parser.add_argument("--full-refresh", action="store_true", help="ignore cursors and fetch everything again")
+    fetch_parser.set_defaults(func=fetch)
+
+    analyze_parser = commands.add_parser("analyze", parents=[common], help="compute stats and forecasts without drawing")
+    analyze_parser.add_argument("--output", default=None, metavar="FILE", help="write the summary as JSON to FILE")
+    analyze_parser.set_defaults(func=analyze)
+
+    render_parser = commands.add_parser("render", parents=[common], help="rebuild the report and charts from the store")
+    render_parser.set_defaults(func=render)
+
+    collaboration_parser = commands.add_parser("collaboration", parents=[common, save_snapshot],
+                                               help="developer collaboration network from issues, comments and reviews")
+    collaboration_parser.add_argument("--offline", action="store_true", default=argparse.SUPPRESS,
+                                      help="do not fetch; build the report from the local store")
+    collaboration_parser.set_defaults(func=collaboration)
+
+    serve_parser = commands.add_parser("serve", parents=[common],
+                                       help="serve the report, charts and metrics over HTTP from memory")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8000, help="port to listen on (default: 8000)")
+    serve_parser.add_argument("--offline", action="store_true", default=argparse.SUPPRESS,
+                              help="never fetch; refresh from the local store or the snapshot")
+    serve_parser.add_argument("--refresh-interval", type=float, default=None, metavar="SECONDS",
+                              help="refresh the data every SECONDS (default: only on POST /refresh)")
+    serve_parser.add_argument("--cache-ttl", type=float, default=300.0, metavar="SECONDS",
+                              help="serve a rendered response for at most SECONDS (default: 300)")
+    serve_parser.set_defaults(func=serve)
+
+    backtest_parser = commands.add_parser("backtest", parents=[common],
+                                          help="replay the forecasts of the history against the issues closed since")
+    backtest_parser.add_argument("--output", default=None, metavar="FILE", help="write the per-team results as JSON to FILE")
+    backtest_parser.set_defaults(func=backtest)
+
+    args = parser.parse_args()
+    args.func(args)
+
 
 if __name__ == "__main__":
-    
-    OrganizationalDashboard().run()
-    
\ No newline at end of file
+    main()